@@ -0,0 +1 @@
+from .tracing import get_tracer, set_tracer
@@ -0,0 +1,104 @@
+import itertools
+
+from . import exceptions
+from .cache import UncacheableValue, fingerprint_value
+
+# The number of records passed through the pipeline before the batch cast functions are called.
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def per_value(batch_function):
+    """
+    Wrap a batch cast function so it can be used as a normal one parameter cast
+    function, for when a single instance is created with __init__.
+    """
+
+    def cast_value(value):
+        return batch_function([value])[0]
+
+    return cast_value
+
+
+class PendingValue:
+    """
+    Stands in for the result of a batch cast function until the chunk is resolved.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+
+class BatchCollector:
+    """
+    Collects the distinct values passed to each batch cast function while a chunk of records
+    is run through the pipeline, then calls each function once for the whole chunk.
+
+    The collecting functions (see cast_functions) are used in place of the batch functions,
+    and return a PendingValue rather than casting anything. resolve swaps every PendingValue
+    in the attribute dictionaries for the result of the batch function.
+    """
+
+    def __init__(self, batch_functions):
+        self.batch_functions = batch_functions
+        # {field name: ({value fingerprint: index}, [distinct values])}
+        self._values = {name: ({}, []) for name in batch_functions}
+        self.cast_functions = {
+            name: self._make_collector(name) for name in batch_functions
+        }
+
+    def _make_collector(self, name):
+        indexes, values = self._values[name]
+
+        def collect(value):
+            try:
+                key = fingerprint_value(value)
+            except UncacheableValue:
+                # Values that can't be fingerprinted are still batched, just not de-duplicated.
+                key = ("uncacheable", len(values))
+            if (index := indexes.get(key)) is None:
+                index = indexes[key] = len(values)
+                values.append(value)
+            return PendingValue(index)
+
+        return collect
+
+    def cast_pending(self, name):
+        """
+        Call the batch function for a field with the distinct values collected since the
+        last call, returning the cast values in the order the values were first collected.
+        The collected values are cleared even if the batch function raises an exception.
+        """
+        indexes, values = self._values[name]
+        if not values:
+            return []
+        try:
+            cast_values = list(self.batch_functions[name](values))
+            if len(cast_values) != len(values):
+                raise exceptions.CastFailed(
+                    f"Batch cast function for field '{name}' returned {len(cast_values)} "
+                    f"value(s) for {len(values)} input value(s)."
+                )
+            return cast_values
+        finally:
+            indexes.clear()
+            values.clear()
+
+    def resolve(self, attribute_dicts):
+        results = {
+            name: cast_values
+            for name in self.batch_functions
+            if (cast_values := self.cast_pending(name))
+        }
+        for attributes in attribute_dicts:
+            for name, cast_values in results.items():
+                if isinstance(value := attributes[name], PendingValue):
+                    attributes[name] = cast_values[value.index]
+        return attribute_dicts
@@ -0,0 +1,197 @@
+import collections
+import pickle
+import time
+
+from . import exceptions
+
+# Scalar types whose values are always hashable and can be used in a fingerprint as they are.
+SCALAR_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+class UncacheableValue(Exception):
+    pass
+
+
+def fingerprint_value(value):
+    """
+    Return a hashable fingerprint of a value. Two values have equal fingerprints only if
+    they have the same types and equal contents, so "1", 1, 1.0 & True all differ.
+
+    Lists, tuples, dictionaries & sets are fingerprinted item by item. Other unhashable
+    values are pickled, and UncacheableValue is raised if that isn't possible.
+    """
+    value_type = type(value)
+    if value_type in SCALAR_TYPES:
+        return value_type, value
+    if value_type in (list, tuple):
+        return value_type, tuple([fingerprint_value(item) for item in value])
+    if value_type is dict:
+        # Order is part of the fingerprint as it is kept when dictionaries are cast.
+        return (
+            value_type,
+            tuple(
+                [
+                    (fingerprint_value(key), fingerprint_value(item))
+                    for key, item in value.items()
+                ]
+            ),
+        )
+    if value_type in (set, frozenset):
+        return value_type, frozenset([fingerprint_value(item) for item in value])
+    try:
+        hash(value)
+        return value_type, value
+    except TypeError:
+        pass
+    try:
+        return value_type, pickle.dumps(value)
+    except Exception as e:
+        raise UncacheableValue(f"Cannot fingerprint {value_type} value: {e}")
+
+
+def fingerprint(mapping, field_names):
+    """
+    Return a fingerprint of the values in a mapping for the supplied field names, in order.
+    Missing fields are part of the fingerprint as they can be treated differently to None.
+    """
+    return tuple(
+        [
+            fingerprint_value(mapping[name]) if name in mapping else ()
+            for name in field_names
+        ]
+    )
+
+
+class ConstructionCache:
+    """
+    A bounded LRU cache of instances keyed on a fingerprint of the records they were
+    created from. Entries older than ttl seconds (if set) are treated as missing.
+
+    class User(CastDataClass):
+        __class_config__ = {"cache": {"max_size": 10000, "ttl": 300}}
+
+    User.from_records(records) then returns cached instances for records it has seen before.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        if max_size < 1:
+            raise ValueError(f"Cache max_size must be at least 1, not {max_size}.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.uncacheable = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(size={len(self)}, max_size={self.max_size}, ttl={self.ttl}, "
+            f"hit_rate={self.hit_rate:.2f})"
+        )
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def stats(self):
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "uncacheable": self.uncacheable,
+        }
+
+    def get(self, key):
+        """
+        Return the cached instance for a key, or None if it is missing or has expired.
+        """
+        try:
+            instance, expires_at = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return instance
+
+    def set(self, key, instance):
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = (instance, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        """
+        Remove a single entry, returning True if it existed.
+        """
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        self._entries.clear()
+
+
+def _refreeze(instance):
+    # Frozen classes are created at run time and can't be found by name, so frozen instances
+    # are pickled as an unfrozen instance and switched back to the frozen class when unpickled.
+    instance.__class__ = instance.__class__._get_frozen_class()
+    return instance
+
+
+def make_frozen_class(cast_class):
+    """
+    Return a subclass of cast_class with the same name whose instances can't be changed.
+    Cached instances are switched to this class as they are shared between callers.
+    """
+
+    def __setattr__(self, name, value):
+        raise exceptions.FrozenInstance(
+            f"Cannot set attribute '{name}' on a cached {cast_class.__name__} instance."
+        )
+
+    def __delattr__(self, name):
+        raise exceptions.FrozenInstance(
+            f"Cannot delete attribute '{name}' on a cached {cast_class.__name__} instance."
+        )
+
+    def __eq__(self, other):
+        # Frozen & unfrozen instances of the same class are equal if their values are.
+        if isinstance(other, cast_class):
+            return self.__dict__ == other.__dict__
+        return False
+
+    def __reduce__(self):
+        unfrozen_instance = cast_class.__new__(cast_class)
+        unfrozen_instance.__dict__.update(self.__dict__)
+        return _refreeze, (unfrozen_instance,)
+
+    return type(
+        cast_class.__name__,
+        (cast_class,),
+        {
+            "__setattr__": __setattr__,
+            "__delattr__": __delattr__,
+            "__eq__": __eq__,
+            "__hash__": None,
+            "__reduce__": __reduce__,
+            "__annotations__": cast_class.__annotations__,
+            "__qualname__": cast_class.__qualname__,
+            "__module__": cast_class.__module__,
+        },
+    )
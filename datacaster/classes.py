@@ -1,14 +1,50 @@
 import inspect
 import logging
 import copy
+import time
 
 from typeguard import check_type
 
-from . import annotation_tools, value_cast, exceptions
+from . import (
+    annotation_tools,
+    batching,
+    compiler,
+    exceptions,
+    ldif,
+    memory,
+    paging,
+    record_store,
+    serializers,
+    tracing,
+)
+from .cache import ConstructionCache, UncacheableValue, fingerprint, make_frozen_class
+from .frame import CastFrame
+from .validation import FULL, Sampled, ValidationResult, should_check_types
 
 logger = logging.getLogger(__name__)
 
 
+def _get_class_config_item(cls, default_value, *keys):
+    # Walk the nested __class_config__ dictionary, returning the default value if
+    # the class has no config or any of the keys along the way are missing.
+    config_item = getattr(cls, "__class_config__", {})
+    try:
+        for key in keys:
+            config_item = config_item[key]
+    except (KeyError, TypeError):
+        return default_value
+    return config_item
+
+
+def _unpickle_projection(parent_class, field_names, attributes):
+    # Projections are created at run time and can't be found by name, so their instances are
+    # pickled with the class they were projected from & the field names instead.
+    projection = parent_class.project(*field_names)
+    instance = projection.__new__(projection)
+    instance.__dict__.update(attributes)
+    return instance
+
+
 class CastDataClass:
     def __eq__(self, other):
         if isinstance(other, self.__class__):
@@ -22,7 +58,8 @@ class CastDataClass:
     def __repr__(self):
         return f"{self.__class__.__name__}({self._attribute_string})"
 
-    def _test_cast_function_maps(self, field_functions, type_functions):
+    @staticmethod
+    def _test_cast_function_maps(field_functions, type_functions):
         invalid_type_cast = {
             annotation: function
             for annotation, function in type_functions.items()
@@ -41,21 +78,12 @@ class CastDataClass:
                 f"fields/annotations do not: {invalid_keys}"
             )
 
-    def _get_field_class_method(self, field_name, instance_methods):
-        try:
-            return next(
-                iter(
-                    [
-                        method_tuple
-                        for method_tuple in instance_methods
-                        if method_tuple[0] == f"__cast_{field_name}__"
-                    ]
-                )
-            )
-        except StopIteration:
-            return None
+    def _get_field_class_method(self, field_name):
+        instance_method = getattr(self, f"__cast_{field_name}__", None)
+        return instance_method if inspect.ismethod(instance_method) else None
 
-    def _get_default_values(self):
+    @classmethod
+    def _get_default_values(cls):
         """
         Return a {name: default_value} dictionary of all attributes that have default
         values in the class annotation. We can get default values by looping over the
@@ -69,16 +97,20 @@ class CastDataClass:
         For the code above, this function will return {"optional_string": "I am optional!"}
         """
         default_values = {}
-        for attribute_name in self.__annotations__:
+        for attribute_name in cls.__annotations__:
             try:
-                attribute_value = getattr(self, attribute_name)
-                if not inspect.ismethod(attribute_value):
+                attribute_value = getattr(cls, attribute_name)
+                # Methods are plain functions when looked up on the class rather than an instance.
+                if not inspect.isfunction(attribute_value) and not inspect.ismethod(
+                    attribute_value
+                ):
                     default_values[attribute_name] = attribute_value
             except AttributeError:
                 pass
         return default_values
 
-    def _get_defaulted_attributes(self, kwargs):
+    @classmethod
+    def _get_defaulted_attributes(cls, kwargs):
         """
         Return a {name: default_value} dictionary of all arguments that will fall back
         to their default values. We use this to type check default values against each
@@ -86,13 +118,14 @@ class CastDataClass:
         """
         return {
             name: value
-            for name, value in self._get_default_values().items()
+            for name, value in cls._get_default_values().items()
             if name not in kwargs
         }
 
-    def _type_check_defaulted_values(self, defaulted_attributes):
+    @classmethod
+    def _type_check_defaulted_values(cls, defaulted_attributes):
         for attribute_name, attribute_value in defaulted_attributes.items():
-            annotation = self.__annotations__[attribute_name]
+            annotation = cls.__annotations__[attribute_name]
             try:
                 check_type(attribute_name, attribute_value, annotation)
             except TypeError:
@@ -101,48 +134,397 @@ class CastDataClass:
                     f"a {type(attribute_value)}. Please change the type annotation or default value."
                 )
 
-    def _get_unexpected_attributes(self, kwargs):
+    @classmethod
+    def _compile_key_table(cls):
+        """
+        Build a single {input_key: field_name} lookup table from the annotations,
+        the "rename_fields" & "field_aliases" config items, and the "case_insensitive_keys"
+        option. Keys are stored lower-cased when matching is case-insensitive.
+
+        class Example(CastDataClass):
+            __class_config__ = {
+                "case_insensitive_keys": True,
+                "field_aliases": {"mail": ["emailAddress"]},
+            }
+            mail: str
+
+        For the code above, the table is {"mail": "mail", "emailaddress": "mail"}.
+
+        Returns None if there is nothing to rename, as every key then resolves to itself.
+        """
+        case_insensitive = _get_class_config_item(cls, False, "case_insensitive_keys")
+        renamed_fields = _get_class_config_item(cls, {}, "rename_fields")
+        field_aliases = _get_class_config_item(cls, {}, "field_aliases")
+
+        if not any([case_insensitive, renamed_fields, field_aliases]):
+            return None
+
+        key_table = {}
+
+        def _add_key(input_key, field_name):
+            if case_insensitive:
+                input_key = input_key.lower()
+            existing_field = key_table.setdefault(input_key, field_name)
+            if existing_field != field_name:
+                raise exceptions.KeyCollision(
+                    f"Input key '{input_key}' maps to both field '{existing_field}' and field '{field_name}'. "
+                    "Please change the field names, renames or aliases in the class config."
+                )
+
+        # A projection still resolves every field of its parent, so they can be skipped.
+        for field_name in cls._get_expected_fields():
+            _add_key(field_name, field_name)
+        for original_name, new_name in renamed_fields.items():
+            _add_key(original_name, new_name)
+        for field_name, aliases in field_aliases.items():
+            for alias in aliases:
+                _add_key(alias, field_name)
+
+        return key_table
+
+    @classmethod
+    def _get_key_table(cls):
+        # The table is compiled once per class and stored on the class itself. Look in the class
+        # __dict__ rather than using getattr so subclasses don't pick up their parent's table.
+        try:
+            return cls.__dict__["_key_table"]
+        except KeyError:
+            key_table = cls._compile_key_table()
+            cls._key_table = key_table
+            return key_table
+
+    @classmethod
+    def _resolve_keys(cls, kwargs):
+        """
+        Return a copy of kwargs with every input key resolved to its field name using
+        the class key table. Keys without an entry in the table are left as they are,
+        so they are still picked up as unexpected attributes if IGNORE_EXTRA is False.
+        """
+        key_table = cls._get_key_table()
+        if key_table is None:
+            return kwargs
+
+        case_insensitive = _get_class_config_item(cls, False, "case_insensitive_keys")
+        resolved_kwargs = {}
+        input_keys = {}
+        for input_key, value in kwargs.items():
+            field_name = key_table.get(
+                input_key.lower() if case_insensitive else input_key, input_key
+            )
+            if field_name in resolved_kwargs:
+                raise exceptions.KeyCollision(
+                    f"Input keys '{input_keys[field_name]}' and '{input_key}' both supply a value for field "
+                    f"'{field_name}'."
+                )
+            resolved_kwargs[field_name] = value
+            input_keys[field_name] = input_key
+        return resolved_kwargs
+
+    @classmethod
+    def _get_expected_fields(cls):
+        return cls.__dict__.get("_parent_annotations", cls.__annotations__)
+
+    @classmethod
+    def _get_unexpected_attributes(cls, kwargs):
         """
         Return a {name: value_type} dictionary of all kwargs provided to the class
-        __init__ that do not have relevant annotations.
+        __init__ that do not have relevant annotations. Fields of the parent class aren't
+        unexpected for a projection (see project), they are just skipped.
         """
+        expected_fields = cls._get_expected_fields()
         return {
-            name: value
-            for name, value in kwargs.items()
-            if name not in self.__annotations__
+            name: value for name, value in kwargs.items() if name not in expected_fields
         }
 
-    def __init__(self, *_, **kwargs):
-        def _get_config_item(func, default_value):
-            try:
-                return func()
-            except (KeyError, AttributeError):
-                return default_value
+    @classmethod
+    def project(cls, *field_names):
+        """
+        Return a derived class that only checks & casts the given fields, and skips the rest
+        of the class fields in its input. The fields keep their cast functions, default values
+        and renames from this class. Projections are created once per set of fields and cached
+        on the class, so the same class is returned however the field names are ordered.
+
+        AuthUser = User.project("sAMAccountName", "mail", "memberOf")
+        for user in AuthUser.from_records(records):
+            ...
+        """
+        if unknown_fields := [
+            name for name in field_names if name not in cls.__annotations__
+        ]:
+            raise exceptions.UnknownField(
+                f"Cannot project {cls.__name__} onto field(s) without annotations: {unknown_fields}."
+            )
+
+        projection_key = frozenset(field_names)
+        if projection_key == cls.__annotations__.keys():
+            return cls
+
+        # Projections of a projection are made from the original class.
+        if (parent_class := cls.__dict__.get("_projection_parent")) is not None:
+            return parent_class.project(*field_names)
+
+        projections = cls.__dict__.get("_projections")
+        if projections is None:
+            projections = cls._projections = {}
+
+        projected_fields = [
+            name for name in cls.__annotations__ if name in projection_key
+        ]
+
+        def __reduce__(self):
+            return (
+                _unpickle_projection,
+                (cls, tuple(projected_fields), dict(self.__dict__)),
+            )
+
+        try:
+            return projections[projection_key]
+        except KeyError:
+            projection = type(
+                cls.__name__,
+                (cls,),
+                {
+                    # Annotations aren't inherited, so the projected fields are set explicitly
+                    # in the order they are annotated in this class.
+                    "__annotations__": {
+                        name: cls.__annotations__[name] for name in projected_fields
+                    },
+                    "_parent_annotations": cls.__annotations__,
+                    "_projection_parent": cls,
+                    "__reduce__": __reduce__,
+                    "__qualname__": cls.__qualname__,
+                    "__module__": cls.__module__,
+                },
+            )
+            projections[projection_key] = projection
+            return projection
+
+    @classmethod
+    def _get_batch_functions(cls):
+        return _get_class_config_item(cls, {}, "batch_fields")
+
+    @classmethod
+    def _get_cast_config(cls, batch_collector=None):
+        """
+        Return the (field_functions, type_functions, always_cast) items from the class config.
+
+        Batch cast functions are returned with the field functions. They are replaced by the
+        collecting functions of batch_collector if one is supplied, otherwise they are wrapped
+        to be called with one value at a time.
+        """
+        field_functions = _get_class_config_item(cls, {}, "cast_functions", "fields")
+        if batch_functions := cls._get_batch_functions():
+            if duplicate_fields := set(field_functions) & set(batch_functions):
+                raise exceptions.MultipleCastDefinitions(
+                    f"Multiple cast definitions for field(s) {sorted(duplicate_fields)}. Found "
+                    "corresponding functions in both cast_functions and batch_fields."
+                )
+            field_functions = {
+                **field_functions,
+                **(
+                    batch_collector.cast_functions
+                    if batch_collector is not None
+                    else {
+                        name: batching.per_value(batch_function)
+                        for name, batch_function in batch_functions.items()
+                    }
+                ),
+            }
+        return (
+            field_functions,
+            _get_class_config_item(cls, {}, "cast_functions", "types"),
+            _get_class_config_item(cls, [], "always_cast"),
+        )
+
+    @staticmethod
+    def _get_missing_value(attribute_name, defaulted_attributes, set_missing_none):
+        """
+        Return the value for an annotated attribute that has not been supplied. This is either
+        its default value, or None if SET_MISSING_NONE is True. MissingArgument is raised otherwise.
+        """
+        if attribute_name in defaulted_attributes:
+            # The attribute has not been supplied but has a default value.
+            return defaulted_attributes[attribute_name]
+
+        # The attribute has not been supplied and does not have a default value.
+        if set_missing_none:
+            return None
+        raise exceptions.MissingArgument(
+            f"No value supplied for mandatory keyword argument {attribute_name}"
+        )
+
+    @classmethod
+    def _get_compiled_fields(cls):
+        """
+        Return a {name: (annotation, checker, caster)} dictionary with the compiled type checker
+        and caster function for each annotated field, in annotation order. Like the key table,
+        this is compiled once per class and stored on the class itself.
+        """
+        try:
+            return cls.__dict__["_compiled_fields"]
+        except KeyError:
+            compiled_fields = {
+                name: (
+                    annotation_tools.parse_annotation(annotation),
+                    *compiler.compile_field(name, annotation),
+                )
+                for name, annotation in cls.__annotations__.items()
+            }
+            cls._compiled_fields = compiled_fields
+            return compiled_fields
+
+    def _select_cast(
+        self,
+        annotated_attribute,
+        compiled_field,
+        attribute_value,
+        field_functions,
+        type_functions,
+        always_cast,
+        check_types=True,
+        sampled=None,
+    ):
+        """
+        Type check a single supplied value using the compiled field checker, and return a
+        (path, cast_function) tuple where path is one of the tracing.PATH_* values. The
+        cast_function is None if the value should be used as it is.
+
+        If check_types is False the value is trusted, unless the field is in always_cast or
+        has a cast function, in which case it is checked and cast as it would be otherwise.
+        Type check failures are recorded as violations when a Sampled validation level is
+        supplied.
+        """
+        annotation, checker, caster = compiled_field
+        instance_method = self._get_field_class_method(annotated_attribute)
+
+        if annotated_attribute not in always_cast:
+            if not check_types:
+                if not (
+                    instance_method
+                    or field_functions.get(annotated_attribute)
+                    or type_functions.get(annotation)
+                ):
+                    return tracing.PATH_TRUSTED, None
+                # Fields with a cast function are still checked, so a value that is already
+                # correct comes out the same as it would with full validation.
+                if checker(attribute_value):
+                    return tracing.PATH_CHECKED, None
+
+            elif checker(attribute_value):
+                ###############################
+                # Type-checking has succeeded #
+                ###############################
+                return tracing.PATH_CHECKED, None
+
+            else:
+                ############################
+                # Type-checking has failed #
+                ############################
+                if sampled is not None:
+                    sampled.record_violation(
+                        self.__class__, annotated_attribute, attribute_value
+                    )
+
+        # If a cast function exists for this field in both the fields dictionary and as a class instance
+        # method, raise an exception to avoid any potential confusion as to which of them was executed.
+        if all([instance_method, field_functions.get(annotated_attribute)]):
+            raise exceptions.MultipleCastDefinitions(
+                f"Multiple cast definitions for field '{annotated_attribute}'. Found corresponding function in "
+                f"class config, and class instance method __cast_{annotated_attribute}__."
+            )
+
+        # Look for a field instance method first.
+        if instance_method:
+            return tracing.PATH_INSTANCE_METHOD, instance_method
+
+        # Otherwise look for a field cast function in __class_config__.
+        elif field_map_function := field_functions.get(annotated_attribute):
+            return tracing.PATH_FIELD_FUNCTION, field_map_function
+
+        # Or a type cast function in __class_config__.
+        elif type_map_function := type_functions.get(annotation):
+            return tracing.PATH_TYPE_FUNCTION, type_map_function
+
+        # Finally use the caster compiled from the annotation.
+        return tracing.PATH_CAST, caster
+
+    def _cast_attribute(
+        self, annotated_attribute, compiled_field, attribute_value, *args
+    ):
+        """
+        Return either the supplied value itself or the result of passing it through the
+        relevant cast. Takes the same arguments as _select_cast.
+        """
+        _, cast_function = self._select_cast(
+            annotated_attribute, compiled_field, attribute_value, *args
+        )
+        if cast_function is None:
+            return attribute_value
+        return cast_function(attribute_value)
+
+    def _trace_attribute(
+        self, tracer, annotated_attribute, compiled_field, attribute_value, *args
+    ):
+        """
+        The same as _cast_attribute, but times the check & cast and passes the result to the
+        tracer. This is only used when a tracer is installed.
+        """
+        start_time = time.perf_counter()
+        path, cast_function = self._select_cast(
+            annotated_attribute, compiled_field, attribute_value, *args
+        )
+        if cast_function is not None:
+            attribute_value = cast_function(attribute_value)
+        tracer.on_field(
+            self.__class__,
+            annotated_attribute,
+            path,
+            time.perf_counter() - start_time,
+        )
+        return attribute_value
+
+    @classmethod
+    def _start_trace(cls):
+        """
+        Return the installed tracer if this instance should be traced, otherwise None.
+        """
+        if (tracer := tracing.active_tracer) is None:
+            return None
+        return tracer if tracer.start_instance(cls) else None
+
+    @classmethod
+    def _get_validation_level(cls, level=None):
+        # A level supplied for a single call overrides the class config.
+        if level is None:
+            return _get_class_config_item(cls, FULL, "validation")
+        return level
+
+    def _build_attributes(self, kwargs, validation_level=None, batch_collector=None):
+        """
+        Run the full check & cast pipeline over a kwargs dictionary and return the
+        {name: value} dictionary of attributes for the new instance without setting them.
+
+        If a BatchCollector is supplied, fields with batch cast functions hold a PendingValue
+        until the collector resolves them.
+        """
+        if tracer := self._start_trace():
+            start_time = time.perf_counter()
+
+        validation_level = self._get_validation_level(validation_level)
+        check_types = should_check_types(validation_level)
+        sampled = validation_level if isinstance(validation_level, Sampled) else None
 
         # The self attributes for these two are read only.
         SET_MISSING_NONE = getattr(self, "SET_MISSING_NONE", True)
         IGNORE_EXTRA = getattr(self, "IGNORE_EXTRA", True)
-        INSTANCE_METHODS = inspect.getmembers(self, predicate=inspect.ismethod)
 
-        FIELD_FUNCTIONS = _get_config_item(
-            lambda: self.__class_config__["cast_functions"]["fields"], {}
+        FIELD_FUNCTIONS, TYPE_FUNCTIONS, ALWAYS_CAST = self._get_cast_config(
+            batch_collector
         )
-        TYPE_FUNCTIONS = _get_config_item(
-            lambda: self.__class_config__["cast_functions"]["types"], {}
-        )
-        ALWAYS_CAST = _get_config_item(lambda: self.__class_config__["always_cast"], [])
 
-        # If any fields are to be renamed, do it now before kwargs are inspected.
-        if RENAMED_FIELDS := _get_config_item(
-            lambda: self.__class_config__["rename_fields"], []
-        ):
-            for original_name, new_name in RENAMED_FIELDS.items():
-                try:
-                    kwargs[new_name] = kwargs[original_name]
-                except KeyError:
-                    # Field is missing from kwargs - carry on.
-                    pass
-                _ = kwargs.pop(original_name, None)
+        # If any fields are to be renamed, aliased or matched case-insensitively, resolve
+        # the input keys to field names now before kwargs are inspected.
+        kwargs = self._resolve_keys(kwargs)
 
         # Type check the default values of any attributes that will be using
         # default values. We want to do this as soon as possible.
@@ -163,156 +545,683 @@ class CastDataClass:
                 )
 
         # Start the main attribute testing & casting loop.
-        for annotated_attribute, annotation in self.__annotations__.items():
-            attribute_value = (
-                None  # Prevent 'might be referenced before assignment' further down.
-            )
-            annotation = annotation_tools.parse_annotation(annotation)
+        for annotated_attribute, compiled_field in self._get_compiled_fields().items():
             try:
                 attribute_value = kwargs[annotated_attribute]
             except KeyError:
-
-                if annotated_attribute in defaulted_attributes:
-                    # The attribute has not been supplied but has a default value.
-                    default_value = defaulted_attributes[annotated_attribute]
-                    logger.debug(
-                        f"attribute {annotated_attribute} will fall back to its default value {repr(default_value)}"
+                new_class_attributes[annotated_attribute] = self._get_missing_value(
+                    annotated_attribute, defaulted_attributes, SET_MISSING_NONE
+                )
+                if tracer:
+                    tracer.on_field(
+                        self.__class__,
+                        annotated_attribute,
+                        (
+                            tracing.PATH_DEFAULT
+                            if annotated_attribute in defaulted_attributes
+                            else tracing.PATH_MISSING
+                        ),
+                        0.0,
                     )
-                    new_class_attributes[annotated_attribute] = default_value
-                    continue
+                continue
 
-                # The attribute has not been supplied and does not have a default value.
-                if SET_MISSING_NONE:
-                    logger.debug(
-                        f"attribute {annotated_attribute} is missing with no default value - setting to None"
-                    )
-                    new_class_attributes[annotated_attribute] = None
-                    continue
-                raise exceptions.MissingArgument(
-                    f"No value supplied for mandatory keyword argument {annotated_attribute}"
-                )
+            cast_args = (
+                annotated_attribute,
+                compiled_field,
+                attribute_value,
+                FIELD_FUNCTIONS,
+                TYPE_FUNCTIONS,
+                ALWAYS_CAST,
+                check_types,
+                sampled,
+            )
+            new_class_attributes[annotated_attribute] = (
+                self._trace_attribute(tracer, *cast_args)
+                if tracer
+                else self._cast_attribute(*cast_args)
+            )
 
-            if annotated_attribute not in ALWAYS_CAST:
-                try:
-                    check_type(annotated_attribute, attribute_value, annotation)
-                    new_class_attributes[annotated_attribute] = attribute_value
-                    ###############################
-                    # Type-checking has succeeded #
-                    ###############################
-                    continue
+        if tracer:
+            tracer.on_instance(self.__class__, time.perf_counter() - start_time)
+        return new_class_attributes
+
+    def __init__(self, *_, **kwargs):
+        for name, value in self._build_attributes(kwargs).items():
+            setattr(self, name, value)
+
+    @classmethod
+    def _iter_attributes(cls, records, validation=None):
+        """
+        Yield the attribute dictionary for each record mapping. If the class has batch cast
+        functions ("batch_fields" in the class config), records are run through the pipeline
+        "batch_size" records at a time, and each batch function is called once per chunk with
+        the distinct values that need casting.
 
-                except TypeError as e:
-                    ############################
-                    # Type-checking has failed #
-                    ############################
-                    logger.debug(f"type-check failed: {e}")
+        class User(CastDataClass):
+            __class_config__ = {
+                "batch_fields": {"manager": resolve_manager_names},
+                "always_cast": ["manager"],
+            }
+        """
+        unset_instance = cls.__new__(cls)
+        if not (batch_functions := cls._get_batch_functions()):
+            for record in records:
+                yield unset_instance._build_attributes(record, validation)
+            return
 
-            # If a cast function exists for this field in both the fields dictionary and as a class instance
-            # method, raise an exception to avoid any potential confusion as to which of them was executed.
-            if all(
+        batch_collector = batching.BatchCollector(batch_functions)
+        for chunk in batching.iter_chunks(records, cls._get_batch_size()):
+            yield from batch_collector.resolve(
                 [
-                    self._get_field_class_method(annotated_attribute, INSTANCE_METHODS),
-                    FIELD_FUNCTIONS.get(annotated_attribute),
+                    unset_instance._build_attributes(
+                        record, validation, batch_collector
+                    )
+                    for record in chunk
                 ]
-            ):
-                raise exceptions.MultipleCastDefinitions(
-                    f"Multiple cast definitions for field '{annotated_attribute}'. Found corresponding function in "
-                    f"class config, and class instance method __cast_{annotated_attribute}__."
+            )
+
+    @classmethod
+    def _iter_instances(cls, records, validation=None):
+        for attributes in cls._iter_attributes(records, validation):
+            instance = cls.__new__(cls)
+            for name, value in attributes.items():
+                setattr(instance, name, value)
+            yield instance
+
+    @classmethod
+    def _get_batch_size(cls):
+        return _get_class_config_item(cls, batching.DEFAULT_BATCH_SIZE, "batch_size")
+
+    @classmethod
+    def get_cache(cls):
+        """
+        Return the ConstructionCache for the class, or None if the "cache" config item isn't set.
+
+        class User(CastDataClass):
+            __class_config__ = {"cache": {"max_size": 10000, "ttl": 300, "freeze": True}}
+        """
+        try:
+            return cls.__dict__["_construction_cache"]
+        except KeyError:
+            cache_config = _get_class_config_item(cls, None, "cache")
+            if cache_config is True:
+                cache_config = {}
+            construction_cache = None
+            if cache_config is not None and cache_config is not False:
+                construction_cache = ConstructionCache(
+                    max_size=cache_config.get("max_size", 1024),
+                    ttl=cache_config.get("ttl"),
                 )
+            cls._construction_cache = construction_cache
+            return construction_cache
 
-            # Look for a field instance method first.
-            if instance_method_tuple := self._get_field_class_method(
-                annotated_attribute, INSTANCE_METHODS
+    @classmethod
+    def _get_frozen_class(cls):
+        try:
+            return cls.__dict__["_frozen_class"]
+        except KeyError:
+            frozen_class = make_frozen_class(cls)
+            cls._frozen_class = frozen_class
+            return frozen_class
+
+    @classmethod
+    def _get_cache_key(cls, record, validation_level):
+        """
+        Return the cache key for a record: the validation level and a fingerprint of the
+        annotated values after keys have been resolved. Returns None if the record can't
+        be cached, so it is built (or fails) the normal way.
+        """
+        resolved_record = cls._resolve_keys(record)
+        # Records with unexpected attributes must raise an exception rather than hit the cache.
+        if not getattr(cls, "IGNORE_EXTRA", True) and cls._get_unexpected_attributes(
+            resolved_record
+        ):
+            return None
+        try:
+            return validation_level, fingerprint(resolved_record, cls.__annotations__)
+        except UncacheableValue as e:
+            logger.debug("record can't be cached: %s", e)
+            cls.get_cache().uncacheable += 1
+            return None
+
+    @classmethod
+    def invalidate_cache(cls, record=None, validation=None):
+        """
+        Remove the cached instance for a record, or every cached instance if no record is supplied.
+        """
+        if (construction_cache := cls.get_cache()) is None:
+            return
+        if record is None:
+            construction_cache.clear()
+        elif key := cls._get_cache_key(record, cls._get_validation_level(validation)):
+            construction_cache.invalidate(key)
+
+    @classmethod
+    def from_records(cls, records, validation=None):
+        """
+        Yield one instance per record mapping. This is the same as calling the class with
+        each record, except the validation level can be set for the call (see datacaster.validation).
+
+        If the "cache" config item is set, instances are returned from the class ConstructionCache
+        for records that have been seen before. Cached instances are frozen (unless "freeze" is
+        False in the cache config) as they are shared. Records aren't cached when validation is sampled.
+
+        Batch cast functions are called once per "batch_size" records (see _iter_attributes), so
+        instances are yielded a chunk at a time when the class has any.
+
+        for user in User.from_records(records, validation=sampled(0.01)):
+            ...
+        """
+        validation_level = cls._get_validation_level(validation)
+        construction_cache = cls.get_cache()
+        if construction_cache is None or isinstance(validation_level, Sampled):
+            yield from cls._iter_instances(records, validation_level)
+            return
+
+        freeze = _get_class_config_item(cls, True, "cache", "freeze") is not False
+        # Look records up a chunk at a time, so cache misses can be built together and share
+        # batch cast function calls. Without batch functions each chunk is a single record.
+        chunk_size = cls._get_batch_size() if cls._get_batch_functions() else 1
+        for chunk in batching.iter_chunks(records, chunk_size):
+            keys = [cls._get_cache_key(record, validation_level) for record in chunk]
+            cached_instances = [
+                None if key is None else construction_cache.get(key) for key in keys
+            ]
+            built_instances = cls._iter_instances(
+                [
+                    record
+                    for record, instance in zip(chunk, cached_instances)
+                    if instance is None
+                ],
+                validation_level,
+            )
+            for key, instance in zip(keys, cached_instances):
+                if instance is None:
+                    instance = next(built_instances)
+                    if key is not None:
+                        if freeze:
+                            instance.__class__ = cls._get_frozen_class()
+                        construction_cache.set(key, instance)
+                yield instance
+
+    @classmethod
+    def iter_ldif(cls, fileobj, validation=None, chunk_size=ldif.DEFAULT_CHUNK_SIZE):
+        """
+        Yield one instance per entry in an LDIF file (e.g. ldifde or ldapsearch output), reading
+        the file in chunks so memory use doesn't grow with the size of the file. Open the file
+        in binary mode for the best performance.
+
+        Each entry is passed through from_records, including its "dn" which can be renamed in the
+        class config. Values are prepared using the annotation of their field:
+        - Multi-valued attributes are gathered into lists, and MultipleValues is raised if the
+          field can't hold a list (e.g. str or Optional[int]).
+        - Base64 values are decoded as UTF-8, unless the field can hold bytes (bytes or Any).
+        Fields with a cast function get their values as they are in the file (a list for
+        multi-valued attributes, bytes for base64 values), as do attributes without a field.
+
+        with open("users.ldif", "rb") as ldif_file:
+            for user in User.iter_ldif(ldif_file):
+                ...
+        """
+        single_valued, text_attributes = cls._get_ldif_attributes()
+        return cls.from_records(
+            ldif.iter_ldif_entries(fileobj, chunk_size, single_valued, text_attributes),
+            validation,
+        )
+
+    @classmethod
+    def _get_ldif_attributes(cls):
+        """
+        Return the (single_valued, text_attributes) sets of lower case attribute names used by
+        iter_ldif, for fields without a cast function.
+        """
+        field_functions, type_functions, _ = cls._get_cast_config()
+        key_table = cls._get_key_table() or {name: name for name in cls.__annotations__}
+        single_valued = set()
+        text_attributes = set()
+        for input_key, field_name in key_table.items():
+            annotation = cls.__annotations__.get(field_name)
+            if (
+                annotation is None
+                or field_name in field_functions
+                or annotation in type_functions
+                or inspect.isfunction(getattr(cls, f"__cast_{field_name}__", None))
             ):
-                instance_method_name, instance_method = instance_method_tuple
-                new_class_attributes[annotated_attribute] = instance_method(
-                    attribute_value
-                )
                 continue
+            if not ldif.accepts_multiple_values(annotation):
+                single_valued.add(input_key.lower())
+            if not ldif.accepts_bytes(annotation):
+                text_attributes.add(input_key.lower())
+        return single_valued, text_attributes
 
-            # Otherwise look for a field cast function in __class_config__.
-            elif field_map_function := FIELD_FUNCTIONS.get(annotated_attribute):
-                new_class_attributes[annotated_attribute] = field_map_function(
-                    attribute_value
+    @classmethod
+    def iter_pages(cls, fetch_page, first_token=None, prefetch=1, validation=None):
+        """
+        Yield one instance per record from a paged source, casting each page while the next
+        prefetch pages are fetched in a background thread.
+
+        fetch_page is a function that takes a page token (first_token for the first page) and
+        returns a (records, next_token) tuple, with next_token None on the last page. If it
+        returns an awaitable, the awaitable is run in an event loop in the background thread,
+        but aiter_pages should be used from async code. See paging.iter_prefetched_pages.
+
+        def fetch_page(token):
+            response = session.get(USERS_URL, params={"page": token}).json()
+            return response["users"], response.get("next_page")
+
+        for user in User.iter_pages(fetch_page, prefetch=2):
+            ...
+        """
+        for records in paging.iter_prefetched_pages(fetch_page, first_token, prefetch):
+            yield from cls.from_records(records, validation)
+
+    @classmethod
+    async def aiter_pages(
+        cls, fetch_page, first_token=None, prefetch=1, validation=None
+    ):
+        """
+        The async version of iter_pages. The next prefetch pages are fetched by a task on the
+        caller's event loop while each page is cast. Normal fetch_page functions are run in the
+        loop's default executor. See paging.aiter_prefetched_pages.
+
+        async def fetch_page(token):
+            async with session.get(USERS_URL, params={"page": token}) as response:
+                body = await response.json()
+            return body["users"], body.get("next_page")
+
+        async for user in User.aiter_pages(fetch_page, prefetch=2):
+            ...
+        """
+        async for records in paging.aiter_prefetched_pages(
+            fetch_page, first_token, prefetch
+        ):
+            for instance in cls.from_records(records, validation):
+                yield instance
+
+    @classmethod
+    def to_frame(cls, records, validation=None):
+        """
+        Run every record mapping through the check & cast pipeline and store the results
+        column by column in a CastFrame, without keeping an instance per record.
+        """
+        return CastFrame.from_records(cls, records, validation)
+
+    @classmethod
+    def write_store(cls, path, instances):
+        """
+        Stream instances into a memory-mapped record store file, returning the number of
+        records written. Instances are encoded one at a time, so any iterable (e.g. from_records
+        or iter_ldif) can be written without holding every instance in memory.
+        """
+        with record_store.RecordStoreWriter(path, cls) as writer:
+            return writer.write_many(instances)
+
+    @classmethod
+    def open_store(cls, path, allow_pickle=False):
+        """
+        Open a record store written by write_store. Records are read by number and their
+        fields are decoded when used, without being checked or cast again.
+
+        Some values are stored with pickle, and reading them raises UnsafeRecordStore unless
+        allow_pickle=True is passed. Only allow pickle for stores from a trusted source, as
+        unpickling a malicious store can run arbitrary code.
+
+        with User.open_store("users.dcrs") as users:
+            users[5000].displayName
+        """
+        return record_store.RecordStore(path, cls, allow_pickle)
+
+    @classmethod
+    def _get_serializer(cls, serializer_class, *args):
+        # Serializers are compiled once per class & set of options, and stored on the class.
+        serializers_by_options = cls.__dict__.get("_serializers")
+        if serializers_by_options is None:
+            serializers_by_options = cls._serializers = {}
+        try:
+            return serializers_by_options[(serializer_class, *args)]
+        except KeyError:
+            serializer = serializer_class(cls, *args)
+            serializers_by_options[(serializer_class, *args)] = serializer
+            return serializer
+
+    @classmethod
+    def write_jsonl(
+        cls, instances, fileobj, buffer_size=serializers.DEFAULT_BUFFER_SIZE
+    ):
+        """
+        Write one JSON object per instance to a text or binary file object, with the fields in
+        annotation order. Instances are serialized as they are consumed from the iterable and
+        written in chunks of around buffer_size characters. Returns the number of instances written.
+
+        with open("users.jsonl", "wb") as jsonl_file:
+            User.write_jsonl(User.iter_ldif(ldif_file), jsonl_file)
+        """
+        serializer = cls._get_serializer(serializers.JSONLinesSerializer)
+        return serializers.write_chunked(
+            fileobj, map(serializer.serialize, instances), buffer_size
+        )
+
+    @classmethod
+    def write_csv(
+        cls,
+        instances,
+        fileobj,
+        header=True,
+        delimiter=",",
+        list_delimiter=None,
+        buffer_size=serializers.DEFAULT_BUFFER_SIZE,
+    ):
+        """
+        Write one CSV row per instance to a text or binary file object, with a header row of
+        field names unless header is False. List fields are joined with list_delimiter, which
+        defaults to the "list_delimiter" config item or ";", and items containing it are quoted
+        (see serializers.CSVSerializer). Instances are streamed the same way as write_jsonl.
+        Returns the number of instances written.
+        """
+        if list_delimiter is None:
+            list_delimiter = _get_class_config_item(
+                cls, serializers.DEFAULT_LIST_DELIMITER, "list_delimiter"
+            )
+        serializer = cls._get_serializer(
+            serializers.CSVSerializer, delimiter, list_delimiter
+        )
+        if header:
+            serializers.write_chunked(fileobj, [serializer.header])
+        return serializers.write_chunked(
+            fileobj, map(serializer.serialize, instances), buffer_size
+        )
+
+    @classmethod
+    def estimate_bytes(cls, sample, count=None):
+        """
+        Create instances from a sample of record mappings and return the number of bytes
+        needed to hold count instances like them, or the sample itself if count is None.
+        Use datacaster.memory.footprint for a per-field breakdown.
+        """
+        sample_footprint = memory.footprint([cls(**record) for record in sample])
+        if count is None:
+            return sample_footprint.total_bytes
+        return round(sample_footprint.per_instance_bytes * count)
+
+    @classmethod
+    def from_row(cls, row, columns, validation=None):
+        """
+        Create a single instance from a sequence of values, where columns holds the
+        input key for each position in the row. See from_rows.
+        """
+        return next(cls.from_rows([row], columns, validation))
+
+    @classmethod
+    def from_rows(cls, rows, columns, validation=None):
+        """
+        Yield one instance per row from an iterable of value sequences (DB cursor rows,
+        csv.reader rows, etc), where columns holds the input key for each position.
+
+        The columns are resolved against the annotations (and any renames, aliases or
+        case-insensitive matching) once, and every row is then cast by position without
+        building an intermediate kwargs dictionary. Annotated fields without a column
+        follow SET_MISSING_NONE and default values exactly as they would in __init__.
+        Batch cast functions are called once per chunk of rows, as in from_records.
+
+        for user in User.from_rows(cursor, columns=["sAMAccountName", "mail"]):
+            ...
+        """
+        SET_MISSING_NONE = getattr(cls, "SET_MISSING_NONE", True)
+        IGNORE_EXTRA = getattr(cls, "IGNORE_EXTRA", True)
+
+        validation_level = cls._get_validation_level(validation)
+        sampled = validation_level if isinstance(validation_level, Sampled) else None
+
+        batch_collector = None
+        if batch_functions := cls._get_batch_functions():
+            batch_collector = batching.BatchCollector(batch_functions)
+        FIELD_FUNCTIONS, TYPE_FUNCTIONS, ALWAYS_CAST = cls._get_cast_config(
+            batch_collector
+        )
+
+        columns = list(columns)
+
+        # Work out which position in each row holds the value for each field. Resolving a
+        # {column: position} dictionary applies the same renames & collision checks as kwargs.
+        if len(set(columns)) != len(columns):
+            raise exceptions.KeyCollision(
+                f"Duplicate column names supplied: {list(columns)}."
+            )
+        field_positions = cls._resolve_keys(
+            {column: position for position, column in enumerate(columns)}
+        )
+
+        if unexpected_attributes := cls._get_unexpected_attributes(field_positions):
+            if not IGNORE_EXTRA:
+                raise exceptions.UnexpectedArgument(
+                    f"Received values for {len(unexpected_attributes)} attribute(s) without "
+                    f"annotations: {list(unexpected_attributes.keys())}."
                 )
-                continue
 
-            # Or a type cast function in __class_config__.
-            elif type_map_function := TYPE_FUNCTIONS.get(annotation):
-                new_class_attributes[annotated_attribute] = type_map_function(
-                    attribute_value
+        # Every row is missing the same fields, so defaults are type checked and
+        # missing values are worked out once for the whole batch.
+        defaulted_attributes = cls._get_defaulted_attributes(field_positions)
+        cls._type_check_defaulted_values(defaulted_attributes)
+        cls._test_cast_function_maps(FIELD_FUNCTIONS, TYPE_FUNCTIONS)
+
+        field_plan = []
+        missing_values = {}
+        for annotated_attribute, compiled_field in cls._get_compiled_fields().items():
+            if annotated_attribute not in field_positions:
+                missing_values[annotated_attribute] = cls._get_missing_value(
+                    annotated_attribute, defaulted_attributes, SET_MISSING_NONE
                 )
-                continue
+            field_plan.append(
+                (
+                    annotated_attribute,
+                    compiled_field,
+                    field_positions.get(annotated_attribute),
+                )
+            )
 
-            # This can be called from multiple code paths, so define it once inside the scope that contains the
-            # annotation, name, and value of each argument.
-            def _cast_simple(valid_type):
-                try:
-                    logger.debug(
-                        f"casting argument {annotated_attribute} to simple type {valid_type}"
+        column_count = len(columns)
+
+        def _iter_row_attributes():
+            for row_index, row in enumerate(rows):
+                if len(row) < column_count:
+                    # Ragged input (e.g. from csv.reader) would otherwise fail with a bare IndexError.
+                    raise exceptions.InvalidRow(
+                        f"Row {row_index} has {len(row)} value(s) but {column_count} columns were "
+                        f"supplied. Missing values for columns: {columns[len(row):]}."
                     )
-                    return value_cast.cast_simple_type(
-                        valid_type, attribute_value, annotated_attribute
+                if tracer := cls._start_trace():
+                    start_time = time.perf_counter()
+                check_types = should_check_types(validation_level)
+                instance = cls.__new__(cls)
+                # Attributes are set in the same order as __init__, defaulted attributes first.
+                new_class_attributes = dict(defaulted_attributes)
+                for annotated_attribute, compiled_field, position in field_plan:
+                    if position is None:
+                        new_class_attributes[annotated_attribute] = missing_values[
+                            annotated_attribute
+                        ]
+                        if tracer:
+                            tracer.on_field(
+                                cls,
+                                annotated_attribute,
+                                (
+                                    tracing.PATH_DEFAULT
+                                    if annotated_attribute in defaulted_attributes
+                                    else tracing.PATH_MISSING
+                                ),
+                                0.0,
+                            )
+                        continue
+
+                    cast_args = (
+                        annotated_attribute,
+                        compiled_field,
+                        row[position],
+                        FIELD_FUNCTIONS,
+                        TYPE_FUNCTIONS,
+                        ALWAYS_CAST,
+                        check_types,
+                        sampled,
                     )
-                except KeyError:
-                    raise exceptions.UnsupportedCast(
-                        f"Field '{annotated_attribute}' has supplied value '{attribute_value}' with invalid "
-                        f"type {attribute_value.__class__}. A {annotation} type value is required "
-                        "but casting the supplied value is not supported yet."
+                    new_class_attributes[annotated_attribute] = (
+                        instance._trace_attribute(tracer, *cast_args)
+                        if tracer
+                        else instance._cast_attribute(*cast_args)
                     )
 
-            if annotation_tools.is_custom_type(annotation):
-                # We can support making lists or tuples of simple builtin types. Work out whether this value should
-                # be a list or tuple. If it should be, then check if the supplied value is already a list or tuple.
-                if annotation_tools.is_collection(annotation):
+                if tracer:
+                    tracer.on_instance(cls, time.perf_counter() - start_time)
+                yield instance, new_class_attributes
 
-                    collection_type = annotation_tools.get_origin(annotation)
-                    valid_types = annotation_tools.get_custom_type_classes(annotation)
-                    cast_collection_values = []
+        if batch_collector is None:
+            chunks = ([built_row] for built_row in _iter_row_attributes())
+        else:
+            chunks = batching.iter_chunks(_iter_row_attributes(), cls._get_batch_size())
 
-                    def _cast_collection_item(value):
-                        # There will only be one because something like typing.List[str, int] isn't valid.
-                        valid_type = valid_types[0]
-                        logger.debug(
-                            f"casting argument {annotated_attribute} collection value {value} to {valid_type}"
-                        )
-                        return value_cast.cast_simple_type(
-                            valid_type, value, annotated_attribute
+        for chunk in chunks:
+            if batch_collector is not None:
+                batch_collector.resolve([attributes for _, attributes in chunk])
+            for instance, new_class_attributes in chunk:
+                for name, value in new_class_attributes.items():
+                    setattr(instance, name, value)
+                yield instance
+
+    @classmethod
+    def validate_many(cls, records):
+        """
+        Check an iterable of record mappings the same way __init__ would (key resolution,
+        extra & missing fields, type checks and cast-ability) without creating any instances.
+
+        Values that pass the type check are never cast; casts are only attempted to find out
+        whether a value that fails the type check can be cast. Batch cast functions are
+        called once per "batch_size" records, and if one raises an exception the error is
+        reported against every record in the chunk that needed it. Returns a ValidationResult.
+
+        result = User.validate_many(records)
+        if not result:
+            for index, field, error in result.errors:
+                ...
+        """
+        SET_MISSING_NONE = getattr(cls, "SET_MISSING_NONE", True)
+        IGNORE_EXTRA = getattr(cls, "IGNORE_EXTRA", True)
+
+        batch_functions = cls._get_batch_functions()
+        batch_collector = (
+            batching.BatchCollector(batch_functions) if batch_functions else None
+        )
+        FIELD_FUNCTIONS, TYPE_FUNCTIONS, ALWAYS_CAST = cls._get_cast_config(
+            batch_collector
+        )
+        cls._test_cast_function_maps(FIELD_FUNCTIONS, TYPE_FUNCTIONS)
+
+        # Default values are the same for every record, so type check each of them once and
+        # only report the failure against records that would fall back to the default.
+        default_values = cls._get_default_values()
+        default_errors = {}
+        for attribute_name, attribute_value in default_values.items():
+            try:
+                cls._type_check_defaulted_values({attribute_name: attribute_value})
+            except exceptions.InvalidDefaultValue as e:
+                default_errors[attribute_name] = e
+
+        compiled_fields = cls._get_compiled_fields()
+
+        # Cast instance methods need an instance to be bound to. One empty instance is
+        # shared by every record and never has any attributes set.
+        unset_instance = cls.__new__(cls)
+
+        mask = bytearray()
+        errors = []
+
+        def enumerate_chunks(records):
+            chunk_start = 0
+            for chunk in batching.iter_chunks(records, cls._get_batch_size()):
+                yield chunk_start, chunk
+                chunk_start += len(chunk)
+
+        for chunk_start, chunk in enumerate_chunks(records):
+            chunk_error_count = len(errors)
+            # {field name: [record index]} for records waiting on a batch cast function.
+            pending_indexes = {}
+            for index, record in enumerate(chunk, chunk_start):
+                error_count = len(errors)
+                try:
+                    record = cls._resolve_keys(record)
+                except exceptions.KeyCollision as e:
+                    errors.append((index, None, e))
+                    mask.append(0)
+                    continue
+
+                if not IGNORE_EXTRA:
+                    for attribute_name in cls._get_unexpected_attributes(record):
+                        errors.append(
+                            (
+                                index,
+                                attribute_name,
+                                exceptions.UnexpectedArgument(
+                                    f"Received value for attribute without annotation: {attribute_name}."
+                                ),
+                            )
                         )
 
-                    if not isinstance(attribute_value, (list, tuple)):
-                        # If the value isn't already a list or tuple, cast it if necessary then put it inside a
-                        # new instance of the collection type specified in the annotation.
-                        cast_collection_values.append(
-                            _cast_collection_item(attribute_value)
+                for annotated_attribute, compiled_field in compiled_fields.items():
+                    try:
+                        attribute_value = record[annotated_attribute]
+                    except KeyError:
+                        if annotated_attribute in default_errors:
+                            errors.append(
+                                (
+                                    index,
+                                    annotated_attribute,
+                                    default_errors[annotated_attribute],
+                                )
+                            )
+                        elif (
+                            annotated_attribute not in default_values
+                            and not SET_MISSING_NONE
+                        ):
+                            errors.append(
+                                (
+                                    index,
+                                    annotated_attribute,
+                                    exceptions.MissingArgument(
+                                        f"No value supplied for mandatory keyword argument {annotated_attribute}"
+                                    ),
+                                )
+                            )
+                        continue
+
+                    try:
+                        cast_value = unset_instance._cast_attribute(
+                            annotated_attribute,
+                            compiled_field,
+                            attribute_value,
+                            FIELD_FUNCTIONS,
+                            TYPE_FUNCTIONS,
+                            ALWAYS_CAST,
+                        )
+                    except Exception as e:
+                        # Cast functions can raise anything, and any failure makes the record invalid.
+                        errors.append((index, annotated_attribute, e))
+                        continue
+                    if isinstance(cast_value, batching.PendingValue):
+                        pending_indexes.setdefault(annotated_attribute, []).append(
+                            index
                         )
-                    else:
-                        for value in attribute_value:
-                            # Iterate over the supplied values and cast them if necessary.
-                            cast_collection_values.append(_cast_collection_item(value))
-                            continue
-
-                    new_class_attributes[annotated_attribute] = collection_type(
-                        cast_collection_values
-                    )
 
-                else:
-                    valid_types = annotation_tools.get_custom_type_classes(annotation)
-                    # The value is not one of the types described by the custom type annotation. As we only
-                    # support basic Union[builtin, None] types, and we almost certainly don't want to cast
-                    # this value to None, we should try to cast it to the other type in the Union. To get
-                    # the type to cast to we need to remove the NoneType entry from the valid_types tuple.
-                    #
-                    # For the annotation typing.Union[str, None] this code will attempt to cast the value
-                    # to a string.
-                    valid_type = next(
-                        filter(lambda x: x != type(None), valid_types)
-                    )  # noqa (ignore E721: using isinstance is not correct here)
-                    new_class_attributes[annotated_attribute] = _cast_simple(valid_type)
+                mask.append(len(errors) == error_count)
 
-            else:
-                # The annotation is not something from the typing module.
-                new_class_attributes[annotated_attribute] = _cast_simple(annotation)
+            for name, indexes in pending_indexes.items():
+                try:
+                    batch_collector.cast_pending(name)
+                except Exception as e:
+                    for index in indexes:
+                        errors.append((index, name, e))
+                        mask[index] = 0
+            if pending_indexes:
+                # Keep the errors in record order.
+                errors[chunk_error_count:] = sorted(
+                    errors[chunk_error_count:], key=lambda error: error[0]
+                )
 
-        for name, value in new_class_attributes.items():
-            setattr(self, name, value)
+        return ValidationResult(mask, errors)
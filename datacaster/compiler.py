@@ -0,0 +1,305 @@
+import enum
+import logging
+
+from collections.abc import Mapping
+from typing import Any, Literal, TypeVar, Union
+
+from typeguard import check_type
+
+from . import annotation_tools, exceptions, value_cast
+
+logger = logging.getLogger(__name__)
+
+NoneType = type(None)
+
+# Values of these types are iterated over when casting to a collection annotation. Any other
+# value is cast & wrapped in a new collection of its own, e.g. "sales" -> ["sales"].
+COLLECTION_INPUT_TYPES = {
+    list: (list, tuple),
+    tuple: (list, tuple),
+    set: (list, tuple, set, frozenset),
+    frozenset: (list, tuple, set, frozenset),
+}
+
+
+# typeguard (which checked every value before fields were compiled) accepts ints for float
+# annotations, ints & floats for complex annotations, and bytearrays for bytes annotations,
+# so the compiled checks do too. memoryview is also accepted for bytes, as PEP 484 allows.
+TYPE_PROMOTIONS = {
+    float: (float, int),
+    complex: (complex, float, int),
+    bytes: (bytes, bytearray, memoryview),
+}
+
+
+def _get_instance_types(annotation):
+    return TYPE_PROMOTIONS.get(annotation, annotation)
+
+
+def _get_args(annotation):
+    # Bare generics (typing.List rather than typing.List[str]) have no args, or TypeVar args.
+    args = getattr(annotation, "__args__", None) or ()
+    if any(isinstance(arg, TypeVar) for arg in args):
+        return ()
+    return args
+
+
+def _cast_failed(value, name, type_name, reason):
+    return exceptions.CastFailed(
+        f"Cannot cast {type(value)} attribute named {name} with value {repr(value)} to {type_name}: {reason}"
+    )
+
+
+def _unsupported_caster(annotation, name):
+    def _cast(value):
+        raise exceptions.UnsupportedCast(
+            f"Field '{name}' has supplied value '{value}' with invalid type {value.__class__}. A {annotation} type "
+            "value is required but casting the supplied value is not supported yet."
+        )
+
+    return _cast
+
+
+def _check_or_cast(checker, caster):
+    # Used for items inside collections that aren't plain str/int/float annotations, which
+    # are only cast if they fail their own type check.
+    def _item(value):
+        return value if checker(value) else caster(value)
+
+    return _item
+
+
+def compile_checker(annotation):
+    """
+    Return a function that takes a value and returns True if it matches the annotation,
+    or None if the annotation (or anything nested inside it) is not supported.
+
+    Supports builtin & other plain classes (including Enum classes), Any, Optional/Union,
+    Literal, List, Set, FrozenSet, Dict, and both fixed-length & variadic Tuple annotations.
+    """
+    annotation = annotation_tools.parse_annotation(annotation)
+    if annotation is Any:
+        return lambda value: True
+
+    origin = getattr(annotation, "__origin__", None)
+    if origin is None:
+        if isinstance(annotation, type):
+            instance_types = _get_instance_types(annotation)
+            return lambda value: isinstance(value, instance_types)
+        return None
+
+    if origin is Literal:
+        # Compare types as well as values so True doesn't match Literal[1].
+        literal_values = {(type(arg), arg) for arg in annotation.__args__}
+
+        def _check_literal(value):
+            try:
+                return (type(value), value) in literal_values
+            except TypeError:
+                # Unhashable values can't be literals.
+                return False
+
+        return _check_literal
+
+    args = _get_args(annotation)
+    if not args:
+        return None
+
+    if origin is Union:
+        if all(isinstance(arg, type) for arg in args):
+            # The most common case, e.g. Optional[str], is a single isinstance call.
+            instance_types = tuple(
+                instance_type
+                for arg in args
+                for instance_type in (
+                    TYPE_PROMOTIONS[arg] if arg in TYPE_PROMOTIONS else (arg,)
+                )
+            )
+            return lambda value: isinstance(value, instance_types)
+        checkers = [compile_checker(arg) for arg in args]
+        if None in checkers:
+            return None
+        return lambda value: any(checker(value) for checker in checkers)
+
+    if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        # Fixed length tuple, e.g. Tuple[int, str].
+        checkers = [compile_checker(arg) for arg in args]
+        if None in checkers:
+            return None
+        return (
+            lambda value: isinstance(value, tuple)
+            and len(value) == len(checkers)
+            and all(checker(item) for checker, item in zip(checkers, value))
+        )
+
+    if origin in COLLECTION_INPUT_TYPES:
+        if (item_checker := compile_checker(args[0])) is None:
+            return None
+        return lambda value: isinstance(value, origin) and all(map(item_checker, value))
+
+    if origin is dict:
+        key_checker, value_checker = [compile_checker(arg) for arg in args]
+        if key_checker is None or value_checker is None:
+            return None
+        return lambda value: isinstance(value, dict) and all(
+            key_checker(k) and value_checker(v) for k, v in value.items()
+        )
+
+    return None
+
+
+def _compile_enum_caster(enum_class, name):
+    def _cast_enum(value):
+        try:
+            return enum_class(value)
+        except ValueError:
+            pass
+        # Fall back to looking the member up by name.
+        try:
+            return enum_class[value]
+        except (KeyError, TypeError):
+            raise _cast_failed(
+                value, name, enum_class, "not a valid member value or name"
+            )
+
+    return _cast_enum
+
+
+def _compile_literal_caster(annotation, name):
+    # Try casting the value to the type of each allowed literal value in turn. bool & None
+    # literals are skipped as bool() & NoneType() would match far too much.
+    literal_values = [
+        arg for arg in annotation.__args__ if not isinstance(arg, (bool, NoneType))
+    ]
+
+    def _cast_literal(value):
+        for literal_value in literal_values:
+            try:
+                if type(literal_value)(value) == literal_value:
+                    return literal_value
+            except (TypeError, ValueError):
+                continue
+        raise _cast_failed(value, name, annotation, "not one of the allowed values")
+
+    return _cast_literal
+
+
+def compile_caster(annotation, name):
+    """
+    Return a function that takes a value which failed the type check for the annotation
+    and casts it, or None if the annotation (or anything nested inside it) is not supported.
+
+    Once a collection has failed its type check, every str, int & float item in it is cast,
+    so List[int] with [True, "2"] becomes [1, 2]. Items with any other annotation are only
+    cast if they fail their own type check.
+
+    List[Optional[int]] -> lambda value: [None if item is None else int(item) for item in value]
+    """
+    annotation = annotation_tools.parse_annotation(annotation)
+    if annotation is Any:
+        return lambda value: value
+
+    origin = getattr(annotation, "__origin__", None)
+    if origin is None:
+        if not isinstance(annotation, type):
+            return None
+        if issubclass(annotation, enum.Enum):
+            return _compile_enum_caster(annotation, name)
+        try:
+            cast_function = value_cast.ANNOTATION_CAST_FUNCTIONS[repr(annotation)]
+        except KeyError:
+            return _unsupported_caster(annotation, name)
+        return lambda value: cast_function(value, name)
+
+    if origin is Literal:
+        return _compile_literal_caster(annotation, name)
+
+    args = _get_args(annotation)
+    if not args:
+        return None
+
+    def _compile_item(item_annotation):
+        if repr(item_annotation) in value_cast.ANNOTATION_CAST_FUNCTIONS:
+            return compile_caster(item_annotation, name)
+        checker = compile_checker(item_annotation)
+        caster = compile_caster(item_annotation, name)
+        if checker is None or caster is None:
+            return None
+        return _check_or_cast(checker, caster)
+
+    if origin is Union:
+        # We almost certainly don't want to cast a value to None, so cast it to the other type.
+        # Unions of more than one other type are ambiguous and not supported.
+        valid_types = [arg for arg in args if arg is not NoneType]
+        if len(valid_types) != 1:
+            return _unsupported_caster(annotation, name)
+        return compile_caster(valid_types[0], name)
+
+    if origin is tuple and len(args) > 1 and args[1] is not Ellipsis:
+        # Fixed length tuple with a different annotation for each position.
+        item_casts = [_compile_item(arg) for arg in args]
+        if None in item_casts:
+            return None
+
+        def _cast_fixed_tuple(value):
+            if not isinstance(value, (list, tuple)) or len(value) != len(item_casts):
+                raise _cast_failed(
+                    value, name, annotation, f"expected {len(item_casts)} values"
+                )
+            return tuple(item_cast(item) for item_cast, item in zip(item_casts, value))
+
+        return _cast_fixed_tuple
+
+    if origin in COLLECTION_INPUT_TYPES:
+        # Tuple[int] and Tuple[int, ...] are both treated as a tuple of any number of ints.
+        if (item_cast := _compile_item(args[0])) is None:
+            return None
+        input_types = COLLECTION_INPUT_TYPES[origin]
+
+        def _cast_collection(value):
+            if isinstance(value, input_types):
+                return origin(map(item_cast, value))
+            # If the value isn't already a collection, cast it if necessary then put it inside
+            # a new instance of the collection type specified in the annotation.
+            return origin((item_cast(value),))
+
+        return _cast_collection
+
+    if origin is dict:
+        key_cast, dict_value_cast = [_compile_item(arg) for arg in args]
+        if key_cast is None or dict_value_cast is None:
+            return None
+
+        def _cast_dict(value):
+            if not isinstance(value, Mapping):
+                raise _cast_failed(value, name, annotation, "value is not a mapping")
+            return {key_cast(k): dict_value_cast(v) for k, v in value.items()}
+
+        return _cast_dict
+
+    return None
+
+
+def compile_field(name, annotation):
+    """
+    Return a (checker, caster) tuple of functions for a field. Annotations the compiler
+    doesn't support are type checked with typeguard & can't be cast.
+    """
+    annotation = annotation_tools.parse_annotation(annotation)
+
+    if (checker := compile_checker(annotation)) is None:
+        logger.debug(
+            f"annotation {annotation} for field {name} will be checked with typeguard"
+        )
+
+        def checker(value):
+            try:
+                check_type(name, value, annotation)
+                return True
+            except TypeError:
+                return False
+
+    if (caster := compile_caster(annotation, name)) is None:
+        caster = _unsupported_caster(annotation, name)
+
+    return checker, caster
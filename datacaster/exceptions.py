@@ -20,3 +20,43 @@ class CastFailed(ValueError):
 
 class MultipleCastDefinitions(Exception):
     pass
+
+
+class KeyCollision(ValueError):
+    pass
+
+
+class InvalidValidationLevel(ValueError):
+    pass
+
+
+class FrozenInstance(AttributeError):
+    pass
+
+
+class InvalidLDIF(ValueError):
+    pass
+
+
+class MultipleValues(ValueError):
+    pass
+
+
+class InvalidRecordStore(ValueError):
+    pass
+
+
+class UnknownField(ValueError):
+    pass
+
+
+class UnknownDiscriminator(ValueError):
+    pass
+
+
+class UnsafeRecordStore(ValueError):
+    pass
+
+
+class InvalidRow(ValueError):
+    pass
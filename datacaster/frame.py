@@ -0,0 +1,283 @@
+import array
+import sys
+
+from typing import Union
+
+from . import annotation_tools
+
+# Annotations that can be stored in a typed array, and the array typecode to use.
+# Optional versions of these annotations use the same typecode plus a null mask.
+ARRAY_TYPECODES = {int: "q", float: "d"}
+
+NUMPY_DTYPES = {"q": "int64", "d": "float64"}
+
+
+def get_array_typecode(annotation):
+    """
+    Return the array typecode for an int/float or Optional[int]/Optional[float]
+    annotation, or None if values for the annotation should be stored in a list.
+    """
+    annotation = annotation_tools.parse_annotation(annotation)
+    if annotation_tools.is_custom_type(annotation):
+        if annotation_tools.get_origin(annotation) is not Union:
+            return None
+        valid_types = [t for t in annotation.__args__ if t is not type(None)]
+        if len(valid_types) != 1:
+            return None
+        annotation = valid_types[0]
+    return ARRAY_TYPECODES.get(annotation)
+
+
+class ArrayColumn:
+    """
+    A column of int or float values stored in an array.array. None values are stored
+    as 0 in the array and flagged in a bytearray null mask, which is only created
+    once the first None value is appended.
+    """
+
+    __slots__ = ("values", "nulls", "value_type")
+
+    def __init__(self, typecode):
+        self.values = array.array(typecode)
+        self.nulls = None
+        self.value_type = int if typecode == "q" else float
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        return self.values[index]
+
+    def __iter__(self):
+        if self.nulls is None:
+            return iter(self.values)
+        return (
+            None if is_null else value
+            for value, is_null in zip(self.values, self.nulls)
+        )
+
+    def append(self, value):
+        """
+        Append a value, returning False without appending anything if the value
+        can't be stored in the array (so the column can be converted to a list).
+        """
+        if value is None:
+            if self.nulls is None:
+                self.nulls = bytearray(len(self.values))
+            self.values.append(0)
+            self.nulls.append(1)
+            return True
+
+        # Check the exact type so values like bools (or int subclasses returned by
+        # cast functions) aren't silently turned into plain ints.
+        if value.__class__ is not self.value_type:
+            # float fields accept ints, which are stored as floats if that is lossless.
+            if self.value_type is not float or value.__class__ is not int:
+                return False
+            try:
+                if float(value) != value:
+                    return False
+            except OverflowError:
+                return False
+            value = float(value)
+        try:
+            self.values.append(value)
+        except OverflowError:
+            return False
+        if self.nulls is not None:
+            self.nulls.append(0)
+        return True
+
+    @property
+    def nbytes(self):
+        nbytes = self.values.itemsize * len(self.values)
+        if self.nulls is not None:
+            nbytes += len(self.nulls)
+        return nbytes
+
+
+class CastFrameRow:
+    """
+    A lightweight read-only view of a single row in a CastFrame. Field values are
+    read from the frame columns when they are accessed.
+    """
+
+    __slots__ = ("_frame", "_index")
+
+    def __init__(self, frame, index):
+        self._frame = frame
+        self._index = index
+
+    def __getattr__(self, name):
+        try:
+            column = self._frame.columns[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{self._frame.cast_class.__name__}' row has no field '{name}'"
+            )
+        return column[self._index]
+
+    def __eq__(self, other):
+        if isinstance(other, CastFrameRow):
+            return (
+                other._frame.cast_class is self._frame.cast_class
+                and other.to_dict() == self.to_dict()
+            )
+        return False
+
+    def __repr__(self):
+        attribute_string = ", ".join(
+            [f"{key}={repr(value)}" for key, value in self.to_dict().items()]
+        )
+        return f"{self._frame.cast_class.__name__}({attribute_string})"
+
+    def to_dict(self):
+        return {
+            name: column[self._index] for name, column in self._frame.columns.items()
+        }
+
+    def to_instance(self):
+        """
+        Create a real instance of the frame's class from this row. The values have
+        already been checked and cast, so they are set without running the pipeline again.
+        """
+        instance = self._frame.cast_class.__new__(self._frame.cast_class)
+        for name, value in self.to_dict().items():
+            setattr(instance, name, value)
+        return instance
+
+
+class CastFrame:
+    """
+    A columnar store for a batch of CastDataClass records. Each annotated field is held
+    in a single column: int & float fields (and their Optional versions) are stored in
+    array.array columns with a null mask, and every other field is stored in a list.
+
+    Rows are only created (as CastFrameRow views) when the frame is indexed or iterated.
+
+    frame = User.to_frame(records)
+    frame[0].sAMAccountName
+    frame.to_numpy("logonCount")
+    """
+
+    def __init__(self, cast_class, columns, length):
+        self.cast_class = cast_class
+        self.columns = columns
+        self._length = length
+
+    @classmethod
+    def _empty_columns(cls, cast_class):
+        columns = {}
+        for field_name, annotation in cast_class.__annotations__.items():
+            typecode = get_array_typecode(annotation)
+            columns[field_name] = ArrayColumn(typecode) if typecode else []
+        return columns
+
+    @classmethod
+    def _from_attribute_dicts(cls, cast_class, attribute_dicts):
+        columns = cls._empty_columns(cast_class)
+        # Bind each column's append method once rather than looking it up for every value.
+        appenders = {name: column.append for name, column in columns.items()}
+        length = 0
+        for attributes in attribute_dicts:
+            for name, append in appenders.items():
+                value = attributes[name]
+                if append(value) is False:
+                    # The value can't be stored in the typed array (e.g. a cast function returned
+                    # a different type), so convert the whole column to a list from now on.
+                    columns[name] = list(columns[name])
+                    columns[name].append(value)
+                    appenders[name] = columns[name].append
+            length += 1
+        return cls(cast_class, columns, length)
+
+    @classmethod
+    def from_records(cls, cast_class, records, validation=None):
+        """
+        Build a frame by running each record mapping through the check & cast pipeline of
+        cast_class, at the given validation level. No instances are created.
+        """
+        return cls._from_attribute_dicts(
+            cast_class, cast_class._iter_attributes(records, validation)
+        )
+
+    @classmethod
+    def from_instances(cls, cast_class, instances):
+        return cls._from_attribute_dicts(
+            cast_class, (vars(instance) for instance in instances)
+        )
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        return CastFrameRow(self, index)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield CastFrameRow(self, index)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.cast_class.__name__}, rows={self._length})"
+
+    def column(self, field_name):
+        """
+        Return the raw column for a field: an ArrayColumn for numeric fields or a list.
+        """
+        return self.columns[field_name]
+
+    def to_numpy(self, field_name):
+        """
+        Return a NumPy array for a field. Numeric columns share the memory of the underlying
+        array.array (no copy), and are returned as masked arrays if they contain None values.
+        Other columns are copied into an object array. NumPy is only needed for this method.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                "NumPy is required for CastFrame.to_numpy. Install it with 'pip install numpy'."
+            )
+
+        column = self.columns[field_name]
+        if not isinstance(column, ArrayColumn):
+            object_array = numpy.empty(len(column), dtype=object)
+            object_array[:] = column
+            return object_array
+
+        values = numpy.frombuffer(
+            column.values, dtype=NUMPY_DTYPES[column.values.typecode]
+        )
+        if column.nulls is None:
+            return values
+        return numpy.ma.MaskedArray(
+            values, mask=numpy.frombuffer(column.nulls, dtype=bool)
+        )
+
+    def to_dicts(self):
+        """
+        Return a list of {name: value} dictionaries, one per row.
+        """
+        names = list(self.columns)
+        rows = zip(*[iter(column) for column in self.columns.values()])
+        return [dict(zip(names, values)) for values in rows]
+
+    def to_instances(self):
+        return [row.to_instance() for row in self]
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes used by the column storage. This doesn't include the field
+        values stored in list columns, which are shared with (not copied from) the input.
+        """
+        return sum(
+            column.nbytes if isinstance(column, ArrayColumn) else sys.getsizeof(column)
+            for column in self.columns.values()
+        )
@@ -0,0 +1,191 @@
+import base64
+import binascii
+
+from typing import Any
+
+from . import annotation_tools, exceptions
+
+# Read LDIF files in large chunks, and split them into lines as bytes rather than
+# decoding every line of the file to a string.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def _iter_lines(fileobj, chunk_size):
+    """
+    Yield each physical line (without its line ending) from a binary or text file object.
+    Only one chunk of the file is held in memory at a time.
+    """
+    remainder = b""
+    while chunk := fileobj.read(chunk_size):
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line[:-1] if line.endswith(b"\r") else line
+    if remainder:
+        yield remainder[:-1] if remainder.endswith(b"\r") else remainder
+
+
+def _iter_logical_lines(fileobj, chunk_size):
+    """
+    Yield each unfolded logical line, and an empty bytes object for every blank line
+    separating entries. Lines starting with a single space continue the previous line,
+    and comments (including folded comments) are dropped.
+    """
+    logical_line = None
+    for line in _iter_lines(fileobj, chunk_size):
+        if line.startswith(b" "):
+            if logical_line is None:
+                raise exceptions.InvalidLDIF(
+                    f"Continuation line without a line to continue: {line}"
+                )
+            logical_line.append(line[1:])
+            continue
+
+        if logical_line is not None:
+            joined_line = b"".join(logical_line)
+            if not joined_line.startswith(b"#"):
+                yield joined_line
+            logical_line = None
+
+        if not line:
+            yield b""
+        else:
+            logical_line = [line]
+
+    if logical_line is not None:
+        joined_line = b"".join(logical_line)
+        if not joined_line.startswith(b"#"):
+            yield joined_line
+
+
+def _iter_annotation_types(annotation):
+    # Yield the annotation, then every type inside it for Union & collection annotations.
+    annotation = annotation_tools.parse_annotation(annotation)
+    yield annotation
+    if annotation_tools.is_custom_type(annotation):
+        for argument in annotation.__args__:
+            if argument is not Ellipsis:
+                yield from _iter_annotation_types(argument)
+
+
+def accepts_multiple_values(annotation):
+    """
+    Return True if a field with this annotation can hold a list of values: a List or Tuple
+    annotation, a Union containing one, or Any.
+    """
+    return any(
+        [
+            annotation_type in (Any, list, tuple)
+            or (
+                annotation_tools.is_custom_type(annotation_type)
+                and annotation_tools.is_collection(annotation_type)
+            )
+            for annotation_type in _iter_annotation_types(annotation)
+        ]
+    )
+
+
+def accepts_bytes(annotation):
+    """
+    Return True if a field with this annotation can hold bytes (e.g. Optional[bytes] or Any).
+    """
+    return any(
+        [
+            annotation_type in (Any, bytes)
+            for annotation_type in _iter_annotation_types(annotation)
+        ]
+    )
+
+
+def decode_value(line):
+    """
+    Return an (attribute, value) tuple from an unfolded LDIF line. Base64 values (attr:: ...)
+    are returned as bytes, as binary values (e.g. objectSid & objectGUID) can also be valid
+    UTF-8. URL values (attr:< ...) are returned as the URL string.
+    """
+    attribute, separator, value = line.partition(b":")
+    if not separator:
+        raise exceptions.InvalidLDIF(f"LDIF line has no attribute separator: {line}")
+    attribute = attribute.decode("ascii")
+
+    if value.startswith(b":"):
+        try:
+            value = base64.b64decode(value[1:].strip(), validate=True)
+        except binascii.Error as e:
+            raise exceptions.InvalidLDIF(
+                f"Invalid base64 value for attribute {attribute}: {e}"
+            )
+        return attribute, value
+
+    if value.startswith(b"<"):
+        value = value[1:]
+    return attribute, value.lstrip(b" ").decode("utf-8")
+
+
+def iter_ldif_entries(
+    fileobj,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    single_valued=frozenset(),
+    text_attributes=frozenset(),
+):
+    """
+    Yield one {attribute: value} dictionary per entry in an LDIF file, including the "dn".
+    Attributes with more than one value are gathered into a list of values. LDAP attribute
+    names are case-insensitive, so values are gathered under the first spelling seen.
+
+    single_valued and text_attributes are sets of lower case attribute names. MultipleValues
+    is raised if a single valued attribute has more than one value, and the base64 values of
+    text attributes are decoded as UTF-8 (raising InvalidLDIF if they can't be).
+
+    with open("users.ldif", "rb") as ldif_file:
+        for entry in iter_ldif_entries(ldif_file):
+            ...
+    """
+    entry = {}
+    # {lower case attribute: attribute} for the current entry.
+    attribute_names = {}
+    first_line = True
+
+    for line in _iter_logical_lines(fileobj, chunk_size):
+        if not line:
+            if entry:
+                yield entry
+                entry = {}
+                attribute_names = {}
+            continue
+
+        attribute, value = decode_value(line)
+        if first_line:
+            first_line = False
+            # Skip the optional "version: 1" line at the start of the file.
+            if attribute.lower() == "version":
+                continue
+
+        lower_attribute = attribute.lower()
+        attribute = attribute_names.setdefault(lower_attribute, attribute)
+        if value.__class__ is bytes and lower_attribute in text_attributes:
+            try:
+                value = value.decode("utf-8")
+            except UnicodeDecodeError:
+                raise exceptions.InvalidLDIF(
+                    f"Base64 value for text attribute {attribute} isn't valid UTF-8."
+                )
+        try:
+            existing_value = entry[attribute]
+        except KeyError:
+            entry[attribute] = value
+            continue
+        if lower_attribute in single_valued:
+            raise exceptions.MultipleValues(
+                f"Attribute {attribute} has more than one value in entry {entry.get('dn')}, "
+                "but its field can only hold one."
+            )
+        if isinstance(existing_value, list):
+            existing_value.append(value)
+        else:
+            entry[attribute] = [existing_value, value]
+
+    if entry:
+        yield entry
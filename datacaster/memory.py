@@ -0,0 +1,138 @@
+import sys
+import tracemalloc
+
+from .frame import ArrayColumn, CastFrame
+
+
+class Footprint:
+    """
+    The memory used by a CastDataClass instance, a batch of instances, or a CastFrame.
+
+    overhead_bytes covers the containers holding the field values (instance objects and
+    their __dict__, or frame column storage). field_bytes is a {name: bytes} dictionary
+    of the memory used by the values of each field. Objects shared between fields or
+    instances are only counted once, against the first field they were found in.
+    """
+
+    def __init__(self, instance_count, overhead_bytes, field_bytes):
+        self.instance_count = instance_count
+        self.overhead_bytes = overhead_bytes
+        self.field_bytes = field_bytes
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(instances={self.instance_count}, total_bytes={self.total_bytes}, "
+            f"field_bytes={self.field_bytes})"
+        )
+
+    @property
+    def total_bytes(self):
+        return self.overhead_bytes + sum(self.field_bytes.values())
+
+    @property
+    def per_instance_bytes(self):
+        if not self.instance_count:
+            return 0
+        return self.total_bytes / self.instance_count
+
+    def largest_fields(self, count=None):
+        """
+        Return (name, bytes) tuples for the fields using the most memory, largest first.
+        """
+        return sorted(self.field_bytes.items(), key=lambda item: item[1], reverse=True)[
+            :count
+        ]
+
+
+def deep_sizeof(value, seen):
+    """
+    Return the size in bytes of a value and everything it contains (dictionary keys & values,
+    collection items, and object attributes). Objects whose ids are in seen are skipped, and
+    the id of every object counted is added to it.
+    """
+    total_bytes = 0
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total_bytes += sys.getsizeof(value)
+
+        if isinstance(value, dict):
+            pending.extend(value.keys())
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            pending.extend(value)
+        elif hasattr(value, "__dict__") and not isinstance(value, type):
+            pending.append(vars(value))
+    return total_bytes
+
+
+def _frame_footprint(frame, seen):
+    overhead_bytes = sys.getsizeof(frame) + sys.getsizeof(frame.columns)
+    field_bytes = {}
+    for name, column in frame.columns.items():
+        if isinstance(column, ArrayColumn):
+            # Numeric values are stored inline in the array, there are no objects to walk.
+            field_bytes[name] = column.nbytes
+        else:
+            seen.add(id(column))
+            field_bytes[name] = sys.getsizeof(column) + sum(
+                deep_sizeof(value, seen) for value in column
+            )
+    return Footprint(len(frame), overhead_bytes, field_bytes)
+
+
+def footprint(instance_or_batch):
+    """
+    Return a Footprint for a single CastDataClass instance, any iterable of instances,
+    or a CastFrame.
+
+    footprint(users).largest_fields(3)
+    """
+    seen = set()
+    if isinstance(instance_or_batch, CastFrame):
+        return _frame_footprint(instance_or_batch, seen)
+
+    try:
+        instances = iter(instance_or_batch)
+    except TypeError:
+        instances = iter([instance_or_batch])
+
+    instance_count = 0
+    overhead_bytes = 0
+    field_bytes = {}
+    for instance in instances:
+        instance_count += 1
+        attributes = vars(instance)
+        seen.update((id(instance), id(attributes)))
+        overhead_bytes += sys.getsizeof(instance) + sys.getsizeof(attributes)
+        for name, value in attributes.items():
+            field_bytes[name] = field_bytes.get(name, 0) + deep_sizeof(value, seen)
+
+    return Footprint(instance_count, overhead_bytes, field_bytes)
+
+
+def measure_peak(func, *args, **kwargs):
+    """
+    Call func with the supplied arguments while tracing memory allocations, and return
+    a (result, peak_bytes) tuple where peak_bytes is the highest amount of memory allocated
+    during the call. The result is kept alive, so building a batch can be measured with:
+
+    users, peak_bytes = measure_peak(list, User.from_rows(rows, columns))
+    """
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        # Python 3.9+ can reset the peak so earlier allocations aren't included.
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        result = func(*args, **kwargs)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    return result, max(peak_bytes - start_bytes, 0)
@@ -0,0 +1,157 @@
+import asyncio
+import inspect
+import queue
+import threading
+
+# How often (in seconds) a fetcher blocked on a full queue checks whether the consumer has stopped.
+STOP_CHECK_INTERVAL = 0.1
+
+_PAGE = "page"
+_DONE = "done"
+_ERROR = "error"
+
+
+def _put(pages, stop, item):
+    # Block until there is room in the queue, returning False if the consumer stops first.
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=STOP_CHECK_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _fetch_pages(fetch_page, first_token, pages, stop):
+    token = first_token
+    # Created the first time fetch_page returns an awaitable, and used for every later page.
+    loop = None
+    try:
+        while not stop.is_set():
+            result = fetch_page(token)
+            if inspect.isawaitable(result):
+                if loop is None:
+                    loop = asyncio.new_event_loop()
+                result = loop.run_until_complete(result)
+            records, token = result
+            if not _put(pages, stop, (_PAGE, records)):
+                return
+            if token is None:
+                break
+    except BaseException as e:
+        # Catch everything (e.g. asyncio.CancelledError or SystemExit) so the consumer is
+        # always sent an item, rather than waiting forever on a fetcher that has died.
+        _put(pages, stop, (_ERROR, e))
+        return
+    finally:
+        if loop is not None:
+            loop.close()
+    _put(pages, stop, (_DONE, None))
+
+
+def _is_async_callable(function):
+    # Also detects objects with an async __call__ method, which iscoroutinefunction doesn't.
+    return inspect.iscoroutinefunction(function) or inspect.iscoroutinefunction(
+        getattr(function, "__call__", None)
+    )
+
+
+async def _async_fetch_pages(fetch_page, first_token, pages, stop):
+    # Sync fetchers are run in the default executor so they don't block the event loop. The
+    # result is awaited whenever it is awaitable, in case fetch_page wasn't detected as async.
+    loop = asyncio.get_running_loop()
+    call_in_executor = not _is_async_callable(fetch_page)
+    token = first_token
+    try:
+        while True:
+            if call_in_executor:
+                result = await loop.run_in_executor(None, fetch_page, token)
+            else:
+                result = fetch_page(token)
+            if inspect.isawaitable(result):
+                result = await result
+            records, token = result
+            await pages.put((_PAGE, records))
+            if token is None:
+                break
+    except BaseException as e:
+        if stop.is_set():
+            # Cancelled by the consumer, which isn't waiting for any more pages.
+            raise
+        await pages.put((_ERROR, e))
+        return
+    await pages.put((_DONE, None))
+
+
+def iter_prefetched_pages(fetch_page, first_token=None, prefetch=1):
+    """
+    Yield the records from each page returned by fetch_page, while a background thread
+    fetches the following pages.
+
+    fetch_page is called with a page token (first_token for the first page) and must
+    return a (records, next_token) tuple, where next_token is None for the last page. If
+    it returns an awaitable (e.g. it is an async function), the awaitable is run in an event
+    loop in the background thread. From async code, use aiter_prefetched_pages instead so
+    pages are fetched on the caller's event loop.
+
+    At most prefetch fetched pages wait in a queue for the consumer, plus one more page held
+    by the fetcher until there is room for it, so a slow consumer holds back the fetcher
+    rather than letting pages pile up.
+
+    Exceptions raised by fetch_page (including BaseExceptions such as asyncio.CancelledError)
+    are raised when the consumer reaches that page.
+    """
+    if prefetch < 1:
+        raise ValueError(f"prefetch must be at least 1, not {prefetch}.")
+
+    pages = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    fetcher = threading.Thread(
+        target=_fetch_pages,
+        args=(fetch_page, first_token, pages, stop),
+        name="datacaster-page-fetcher",
+        daemon=True,
+    )
+    fetcher.start()
+
+    try:
+        while True:
+            kind, value = pages.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+    finally:
+        # Let the fetcher finish if the consumer stops early or an exception is raised.
+        stop.set()
+
+
+async def aiter_prefetched_pages(fetch_page, first_token=None, prefetch=1):
+    """
+    The async version of iter_prefetched_pages, for use with async for. Pages are fetched
+    by a task on the caller's event loop, and wait for the consumer in an asyncio.Queue of
+    size prefetch. fetch_page can be an async function (or any function returning an
+    awaitable), or a normal function, which is run in the loop's default executor.
+    """
+    if prefetch < 1:
+        raise ValueError(f"prefetch must be at least 1, not {prefetch}.")
+
+    pages = asyncio.Queue(maxsize=prefetch)
+    stop = asyncio.Event()
+    fetcher = asyncio.create_task(
+        _async_fetch_pages(fetch_page, first_token, pages, stop)
+    )
+
+    try:
+        while True:
+            kind, value = await pages.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+    finally:
+        # Cancel the fetcher if the consumer stops early or an exception is raised.
+        stop.set()
+        fetcher.cancel()
@@ -0,0 +1,430 @@
+import array
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+from typing import Union
+
+from . import annotation_tools, exceptions
+
+MAGIC = b"DCRS"
+FORMAT_VERSION = 1
+
+# MAGIC, format version, schema length. The JSON schema follows the header.
+HEADER = struct.Struct("<4sHI")
+# Index offset, record count, MAGIC. The record offset index comes just before the footer.
+FOOTER = struct.Struct("<QQ4s")
+# Every field has an 8 byte slot holding either the value itself (int, float & bool fields)
+# or the offset & length of the value in the variable length section of the record.
+SLOT = struct.Struct("<q")
+FLOAT_SLOT = struct.Struct("<d")
+SPAN = struct.Struct("<II")
+COUNT = struct.Struct("<I")
+
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+FIXED_KINDS = {int: "int", float: "float", bool: "bool"}
+VARIABLE_KINDS = {str: "str", bytes: "bytes"}
+ITEM_KINDS = {**FIXED_KINDS, **VARIABLE_KINDS}
+KIND_TYPES = {kind: kind_type for kind_type, kind in ITEM_KINDS.items()}
+
+PICKLE_KIND = "pickle"
+
+
+def get_field_kind(annotation):
+    """
+    Return the storage kind for an annotation: "int", "float", "bool", "str" or "bytes"
+    (or their Optional versions), "list[<kind>]" or "tuple[<kind>]" for List & Tuple
+    annotations of those types, or "pickle" for everything else.
+    """
+    annotation = annotation_tools.parse_annotation(annotation)
+    if not annotation_tools.is_custom_type(annotation):
+        return ITEM_KINDS.get(annotation, PICKLE_KIND)
+
+    origin = annotation_tools.get_origin(annotation)
+    if origin is Union:
+        valid_types = [t for t in annotation.__args__ if t is not type(None)]
+        if len(valid_types) != 1:
+            return PICKLE_KIND
+        return get_field_kind(valid_types[0])
+
+    if annotation_tools.is_collection(annotation):
+        item_types = list(annotation.__args__)
+        if item_types[1:] not in ([], [Ellipsis]) or item_types[0] not in ITEM_KINDS:
+            return PICKLE_KIND
+        return f"{origin.__name__}[{ITEM_KINDS[item_types[0]]}]"
+
+    return PICKLE_KIND
+
+
+def get_schema(cast_class):
+    return [
+        [name, get_field_kind(annotation)]
+        for name, annotation in cast_class.__annotations__.items()
+    ]
+
+
+def _as_float(value):
+    # ints are stored in float slots when they convert to a float exactly, and pickled otherwise.
+    if value.__class__ is float:
+        return value
+    if value.__class__ is int:
+        try:
+            if float(value) == value:
+                return float(value)
+        except OverflowError:
+            pass
+    return None
+
+
+def _encode_items(item_kind, values):
+    # A list is stored as its item count, followed by either the 8 byte item values, or an
+    # offset table (relative to the end of the table) and the encoded item bytes.
+    if item_kind == "float":
+        values = [_as_float(value) for value in values]
+        if None in values:
+            return None
+    elif any(value.__class__ is not KIND_TYPES[item_kind] for value in values):
+        return None
+
+    encoded = bytearray(COUNT.pack(len(values)))
+    if item_kind == "float":
+        encoded += struct.pack(f"<{len(values)}d", *values)
+    elif item_kind in ("int", "bool"):
+        if any(not INT64_MIN <= value <= INT64_MAX for value in values):
+            return None
+        encoded += struct.pack(f"<{len(values)}q", *values)
+    else:
+        items = (
+            [value.encode("utf-8") for value in values]
+            if item_kind == "str"
+            else values
+        )
+        offsets = [0]
+        for item in items:
+            offsets.append(offsets[-1] + len(item))
+        encoded += struct.pack(f"<{len(offsets)}I", *offsets)
+        encoded += b"".join(items)
+    return encoded
+
+
+def _decode_items(item_kind, buffer, offset):
+    (count,) = COUNT.unpack_from(buffer, offset)
+    offset += COUNT.size
+    if item_kind == "float":
+        return list(struct.unpack_from(f"<{count}d", buffer, offset))
+    if item_kind in ("int", "bool"):
+        values = struct.unpack_from(f"<{count}q", buffer, offset)
+        return (
+            [bool(value) for value in values] if item_kind == "bool" else list(values)
+        )
+
+    offsets = struct.unpack_from(f"<{count + 1}I", buffer, offset)
+    data_offset = offset + 4 * (count + 1)
+    items = [
+        bytes(buffer[data_offset + start : data_offset + end])
+        for start, end in zip(offsets, offsets[1:])
+    ]
+    if item_kind == "str":
+        return [item.decode("utf-8") for item in items]
+    return items
+
+
+class RecordStoreWriter:
+    """
+    Stream instances of a CastDataClass into a record store file. Each instance is encoded
+    and written as it is supplied, and only the 8 byte offset of each record is kept in memory.
+    The record offset index and footer are written when the writer is closed.
+
+    If the with block exits with an exception, the file is truncated rather than closed, so
+    an incomplete store can't be opened by mistake.
+
+    with RecordStoreWriter("users.dcrs", User) as writer:
+        for user in User.iter_ldif(ldif_file):
+            writer.write(user)
+    """
+
+    def __init__(self, path, cast_class):
+        self.cast_class = cast_class
+        self.schema = get_schema(cast_class)
+        self._field_count = len(self.schema)
+        self._bitmap_size = (self._field_count + 7) // 8
+        self._fixed_size = 2 * self._bitmap_size + SLOT.size * self._field_count
+        self._offsets = array.array("Q")
+
+        self._file = open(path, "wb")
+        schema_bytes = json.dumps(
+            {"class": cast_class.__name__, "fields": self.schema}
+        ).encode("utf-8")
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(schema_bytes)))
+        self._file.write(schema_bytes)
+        self._position = HEADER.size + len(schema_bytes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def _encode_record(self, instance):
+        attributes = vars(instance)
+        record = bytearray(self._fixed_size)
+        variable_offset = self._fixed_size
+        variable_data = []
+
+        for index, (name, kind) in enumerate(self.schema):
+            value = attributes.get(name)
+            bit_offset, bit = divmod(index, 8)
+            slot_offset = 2 * self._bitmap_size + SLOT.size * index
+
+            if value is None:
+                record[bit_offset] |= 1 << bit
+                continue
+
+            encoded = None
+            value_type = value.__class__
+            if kind == "float":
+                if (float_value := _as_float(value)) is not None:
+                    FLOAT_SLOT.pack_into(record, slot_offset, float_value)
+                    continue
+            elif kind in FIXED_KINDS.values():
+                if value_type is KIND_TYPES[kind]:
+                    if INT64_MIN <= value <= INT64_MAX:
+                        SLOT.pack_into(record, slot_offset, value)
+                        continue
+            elif kind == "str":
+                if value_type is str:
+                    encoded = value.encode("utf-8")
+            elif kind == "bytes":
+                if value_type is bytes:
+                    encoded = value
+            elif kind != PICKLE_KIND:
+                container, item_kind = kind[:-1].split("[")
+                if value_type.__name__ == container:
+                    encoded = _encode_items(item_kind, value)
+
+            if encoded is None:
+                # The value doesn't match the annotation (e.g. a cast function returned a different
+                # type), or the annotation can only be stored by pickling.
+                record[self._bitmap_size + bit_offset] |= 1 << bit
+                encoded = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            SPAN.pack_into(record, slot_offset, variable_offset, len(encoded))
+            variable_data.append(encoded)
+            variable_offset += len(encoded)
+
+        record += b"".join(variable_data)
+        return record
+
+    def write(self, instance):
+        record = self._encode_record(instance)
+        self._offsets.append(self._position)
+        self._file.write(record)
+        self._position += len(record)
+
+    def write_many(self, instances):
+        for instance in instances:
+            self.write(instance)
+        return len(self)
+
+    def close(self):
+        if self._file.closed:
+            return
+        offsets = self._offsets
+        if sys.byteorder != "little":
+            offsets = array.array("Q", offsets)
+            offsets.byteswap()
+        self._file.write(offsets.tobytes())
+        self._file.write(FOOTER.pack(self._position, len(self._offsets), MAGIC))
+        self._file.close()
+
+    def abort(self):
+        """
+        Close the writer without writing the index & footer, truncating the file so opening it
+        raises InvalidRecordStore.
+        """
+        if self._file.closed:
+            return
+        self._file.truncate(0)
+        self._file.close()
+
+
+class StoredRecord:
+    """
+    A lazy view of a single record in a RecordStore. Each field is decoded from the
+    memory-mapped file when it is accessed, without type checking or casting it again.
+    """
+
+    __slots__ = ("_store", "_offset")
+
+    def __init__(self, store, offset):
+        self._store = store
+        self._offset = offset
+
+    def __getattr__(self, name):
+        try:
+            index = self._store.field_indexes[name]
+        except KeyError:
+            raise AttributeError(f"Stored record has no field '{name}'")
+        return self._store._decode_field(self._offset, index)
+
+    def __repr__(self):
+        attribute_string = ", ".join(
+            [f"{key}={repr(value)}" for key, value in self.to_dict().items()]
+        )
+        return f"{self._store.class_name}({attribute_string})"
+
+    def __eq__(self, other):
+        if isinstance(other, StoredRecord):
+            return other.to_dict() == self.to_dict()
+        return False
+
+    def to_dict(self):
+        return {
+            name: self._store._decode_field(self._offset, index)
+            for index, (name, _) in enumerate(self._store.schema)
+        }
+
+    def to_instance(self, cast_class=None):
+        """
+        Create an instance from the stored values without running the check & cast pipeline.
+        """
+        cast_class = cast_class or self._store.cast_class
+        if cast_class is None:
+            raise TypeError(
+                "A CastDataClass is needed to create an instance from this record store."
+            )
+        instance = cast_class.__new__(cast_class)
+        for name, value in self.to_dict().items():
+            setattr(instance, name, value)
+        return instance
+
+
+class RecordStore:
+    """
+    A read-only, memory-mapped record store file written by RecordStoreWriter. Records can be
+    accessed by number without reading the records before them, and their fields are only
+    decoded when they are used.
+
+    If a CastDataClass is supplied, its schema must match the schema stored in the file.
+
+    Fields without a fixed encoding (and values that didn't match their annotation) are
+    stored with pickle, and unpickling data can run arbitrary code. Reading a pickled value
+    raises UnsafeRecordStore unless allow_pickle=True is passed, which should only be done
+    for stores from a trusted source.
+
+    with RecordStore("users.dcrs", User) as users:
+        users[1000000].sAMAccountName
+    """
+
+    def __init__(self, path, cast_class=None, allow_pickle=False):
+        self.cast_class = cast_class
+        self.allow_pickle = allow_pickle
+        with open(path, "rb") as store_file:
+            if os.fstat(store_file.fileno()).st_size < HEADER.size + FOOTER.size:
+                raise exceptions.InvalidRecordStore(
+                    f"{path} is too small to be a datacaster record store."
+                )
+            self._mmap = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, schema_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise exceptions.InvalidRecordStore(
+                f"{path} is not a version {FORMAT_VERSION} datacaster record store."
+            )
+        index_offset, self._length, footer_magic = FOOTER.unpack_from(
+            self._mmap, len(self._mmap) - FOOTER.size
+        )
+        if footer_magic != MAGIC:
+            self.close()
+            raise exceptions.InvalidRecordStore(
+                f"{path} has no footer. The writer may not have been closed."
+            )
+        self._index_offset = index_offset
+
+        schema = json.loads(self._mmap[HEADER.size : HEADER.size + schema_size])
+        self.class_name = schema["class"]
+        self.schema = [tuple(field) for field in schema["fields"]]
+        if cast_class is not None and self.schema != [
+            tuple(field) for field in get_schema(cast_class)
+        ]:
+            self.close()
+            raise exceptions.InvalidRecordStore(
+                f"The schema in {path} doesn't match the annotations of {cast_class.__name__}."
+            )
+
+        self.field_indexes = {
+            name: index for index, (name, _) in enumerate(self.schema)
+        }
+        self._bitmap_size = (len(self.schema) + 7) // 8
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"{self.__class__.__name__} index out of range")
+        (offset,) = struct.unpack_from("<Q", self._mmap, self._index_offset + 8 * index)
+        return StoredRecord(self, offset)
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
+
+    def close(self):
+        self._mmap.close()
+
+    def read_field(self, index, name):
+        return getattr(self[index], name)
+
+    def _decode_field(self, record_offset, index):
+        buffer = self._mmap
+        bit_offset, bit = divmod(index, 8)
+        if buffer[record_offset + bit_offset] & (1 << bit):
+            return None
+
+        slot_offset = record_offset + 2 * self._bitmap_size + SLOT.size * index
+        kind = self.schema[index][1]
+        if buffer[record_offset + self._bitmap_size + bit_offset] & (1 << bit):
+            kind = PICKLE_KIND
+        elif kind == "float":
+            return FLOAT_SLOT.unpack_from(buffer, slot_offset)[0]
+        elif kind == "int":
+            return SLOT.unpack_from(buffer, slot_offset)[0]
+        elif kind == "bool":
+            return bool(SLOT.unpack_from(buffer, slot_offset)[0])
+
+        value_offset, value_length = SPAN.unpack_from(buffer, slot_offset)
+        value_offset += record_offset
+        if kind == "str":
+            return buffer[value_offset : value_offset + value_length].decode("utf-8")
+        if kind == "bytes":
+            return buffer[value_offset : value_offset + value_length]
+        if kind == PICKLE_KIND:
+            if not self.allow_pickle:
+                raise exceptions.UnsafeRecordStore(
+                    f"Field '{self.schema[index][0]}' is pickled, and unpickling is disabled "
+                    "for this record store (allow_pickle=False)."
+                )
+            return pickle.loads(buffer[value_offset : value_offset + value_length])
+
+        container, item_kind = kind[:-1].split("[")
+        items = _decode_items(item_kind, buffer, value_offset)
+        return tuple(items) if container == "tuple" else items
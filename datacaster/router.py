@@ -0,0 +1,135 @@
+from . import batching, exceptions
+
+
+class CastRouter:
+    """
+    Creates instances of different CastDataClass subclasses from a mixed stream of records,
+    picking the class for each record from a precompiled {discriminator value: class} table.
+
+    The discriminator is either the name of a record field or a function that takes a record
+    and returns its discriminator value. If the value is a list (e.g. a multi-valued objectClass),
+    its items are looked up from last to first and the first match is used, so the most specific
+    LDAP object class wins ("computer" is listed after "user" for computer objects).
+
+    Records whose discriminator isn't in the table are passed to fallback, and are otherwise
+    skipped. UnknownDiscriminator is raised for them if there is no fallback.
+
+    With case_insensitive, both the discriminator field name and its values are matched
+    case-insensitively, as LDAP attribute names & object classes are.
+
+    router = CastRouter(
+        {"user": User, "group": Group, "computer": Computer, "contact": Contact},
+        discriminator="objectClass",
+        case_insensitive=True,
+        fallback=unknown_records.append,
+    )
+    for cast_class, instance in router.iter_tagged(ldif.iter_ldif_entries(ldif_file)):
+        ...
+    """
+
+    def __init__(self, routes, discriminator, fallback=None, case_insensitive=False):
+        self.discriminator = discriminator
+        self.fallback = fallback
+        self.case_insensitive = case_insensitive
+        self.cast_classes = list(dict.fromkeys(routes.values()))
+        self._routing_table = {
+            self._normalise(value): cast_class for value, cast_class in routes.items()
+        }
+        if callable(discriminator):
+            self._get_discriminator_value = discriminator
+        elif case_insensitive:
+            self._get_discriminator_value = self._get_field_value_case_insensitive
+        else:
+            self._get_discriminator_value = lambda record: record.get(discriminator)
+
+    def _get_field_value_case_insensitive(self, record):
+        # Try the exact spelling first, as it is by far the most common.
+        try:
+            return record[self.discriminator]
+        except KeyError:
+            pass
+        field_name = self.discriminator.lower()
+        for key, value in record.items():
+            if isinstance(key, str) and key.lower() == field_name:
+                return value
+        return None
+
+    def _normalise(self, value):
+        if self.case_insensitive and isinstance(value, str):
+            return value.lower()
+        return value
+
+    def route(self, record):
+        """
+        Return the class for a record, or None if its discriminator isn't in the table.
+        """
+        value = self._get_discriminator_value(record)
+        for item in reversed(value) if isinstance(value, (list, tuple)) else [value]:
+            try:
+                cast_class = self._routing_table.get(self._normalise(item))
+            except TypeError:
+                # Unhashable discriminator values can't be in the table.
+                continue
+            if cast_class is not None:
+                return cast_class
+        return None
+
+    def _handle_unknown(self, record):
+        if self.fallback is None:
+            raise exceptions.UnknownDiscriminator(
+                f"No class found for discriminator value "
+                f"{repr(self._get_discriminator_value(record))}."
+            )
+        self.fallback(record)
+
+    def cast(self, record, validation=None):
+        """
+        Return an instance of the routed class for a single record, or None if the
+        record was passed to the fallback handler.
+        """
+        if (cast_class := self.route(record)) is None:
+            self._handle_unknown(record)
+            return None
+        return next(cast_class.from_records([record], validation))
+
+    def to_buckets(self, records, validation=None):
+        """
+        Route every record, then create the instances for each class with a single
+        from_records call, so each class caches and batches its records as it normally would.
+        Returns a {class: [instances]} dictionary with an entry for every routed class.
+        """
+        buckets = {cast_class: [] for cast_class in self.cast_classes}
+        for record in records:
+            if (cast_class := self.route(record)) is None:
+                self._handle_unknown(record)
+            else:
+                buckets[cast_class].append(record)
+        return {
+            cast_class: list(cast_class.from_records(class_records, validation))
+            for cast_class, class_records in buckets.items()
+        }
+
+    def iter_tagged(
+        self, records, validation=None, chunk_size=batching.DEFAULT_BATCH_SIZE
+    ):
+        """
+        Yield a (class, instance) tuple per record, in the same order as the records. Records
+        are read chunk_size at a time and each class creates its instances for the chunk with
+        one from_records call, so memory use doesn't grow with the number of records.
+        """
+        for chunk in batching.iter_chunks(records, chunk_size):
+            routed_classes = []
+            records_by_class = {}
+            for record in chunk:
+                if (cast_class := self.route(record)) is None:
+                    self._handle_unknown(record)
+                    continue
+                routed_classes.append(cast_class)
+                records_by_class.setdefault(cast_class, []).append(record)
+
+            instances_by_class = {
+                cast_class: cast_class.from_records(class_records, validation)
+                for cast_class, class_records in records_by_class.items()
+            }
+            for cast_class in routed_classes:
+                yield cast_class, next(instances_by_class[cast_class])
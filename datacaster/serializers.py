@@ -0,0 +1,216 @@
+import base64
+import enum
+import io
+import json
+import math
+import re
+
+from .record_store import get_field_kind
+
+# Serialized records are gathered until they reach this many characters, then written in one call.
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+DEFAULT_LIST_DELIMITER = ";"
+
+_encode_json_string = json.encoder.encode_basestring
+
+
+def _to_builtin(value):
+    # Fallback conversion for values with no JSON or CSV representation of their own.
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_json_value(value):
+    return json.dumps(value, ensure_ascii=False, default=_to_builtin)
+
+
+def _encode_json_float(value):
+    return repr(value) if math.isfinite(value) else _encode_json_value(value)
+
+
+# {field kind: (value type, encoder)} for JSON values. Values of any other type (e.g. from
+# a cast function returning something unexpected) fall back to json.dumps.
+JSON_ENCODERS = {
+    "str": (str, _encode_json_string),
+    "int": (int, int.__repr__),
+    "float": (float, _encode_json_float),
+    "bool": (bool, lambda value: "true" if value else "false"),
+}
+
+
+def _make_json_encoder(kind):
+    if kind in JSON_ENCODERS:
+        value_type, encode = JSON_ENCODERS[kind]
+
+        def encode_value(value):
+            if value.__class__ is value_type:
+                return encode(value)
+            if value is None:
+                return "null"
+            return _encode_json_value(value)
+
+        return encode_value
+
+    if kind in ("list[str]", "tuple[str]"):
+
+        def encode_strings(value):
+            if value.__class__ in (list, tuple) and all(
+                [item.__class__ is str for item in value]
+            ):
+                return f"[{','.join([_encode_json_string(item) for item in value])}]"
+            return _encode_json_value(value)
+
+        return encode_strings
+
+    return _encode_json_value
+
+
+class JSONLinesSerializer:
+    """
+    Serializes instances to JSON objects, compiled once per class from its annotations.
+    Fields are written in annotation order, and str, int, float & bool fields (including
+    lists of strings) are encoded directly rather than through json.dumps.
+    """
+
+    def __init__(self, cast_class):
+        self.fields = [
+            (
+                f"{_encode_json_string(name)}:",
+                name,
+                _make_json_encoder(get_field_kind(annotation)),
+            )
+            for name, annotation in cast_class.__annotations__.items()
+        ]
+
+    def serialize(self, instance):
+        attributes = vars(instance)
+        return (
+            "{"
+            + ",".join(
+                [
+                    key_prefix + encode(attributes[name])
+                    for key_prefix, name, encode in self.fields
+                ]
+            )
+            + "}\n"
+        )
+
+
+class CSVSerializer:
+    """
+    Serializes instances to CSV rows, compiled once per class from its annotations. Fields
+    are written in annotation order, None is written as an empty value, and the items of list
+    fields are joined with list_delimiter. Values are only quoted if they contain the delimiter,
+    a quote or a line break, as csv.QUOTE_MINIMAL would.
+
+    List items are quoted the same way if they contain list_delimiter, a quote or a line break,
+    so a list value can be split with csv.reader([value], delimiter=list_delimiter).
+    """
+
+    def __init__(
+        self, cast_class, delimiter=",", list_delimiter=DEFAULT_LIST_DELIMITER
+    ):
+        self.delimiter = delimiter
+        self.list_delimiter = list_delimiter
+        self._needs_quotes = re.compile(f'[{re.escape(delimiter)}"\r\n]').search
+        self._item_needs_quotes = re.compile(
+            f'{re.escape(list_delimiter)}|["\r\n]'
+        ).search
+        self.fields = [
+            (name, self._make_encoder(get_field_kind(annotation)))
+            for name, annotation in cast_class.__annotations__.items()
+        ]
+        self.header = self._join([self._escape(name) for name, _ in self.fields])
+
+    def _escape(self, text, needs_quotes=None):
+        if (needs_quotes or self._needs_quotes)(text):
+            return '"' + text.replace('"', '""') + '"'
+        return text
+
+    def _to_text(self, value):
+        if value is None:
+            return ""
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return self.list_delimiter.join(
+                [
+                    self._escape(self._to_text(item), self._item_needs_quotes)
+                    for item in value
+                ]
+            )
+        if isinstance(value, (str, int, float)):
+            return str(value)
+        return str(_to_builtin(value))
+
+    def _make_encoder(self, kind):
+        escape, to_text = self._escape, self._to_text
+        if kind in ("int", "float", "bool"):
+            # Numbers & bools never contain a delimiter or quote, so they are never escaped.
+            return lambda value: (
+                str(value)
+                if value.__class__ in (int, float, bool)
+                else escape(to_text(value))
+            )
+        if kind == "str":
+            return lambda value: escape(
+                value if value.__class__ is str else to_text(value)
+            )
+        return lambda value: escape(to_text(value))
+
+    def _join(self, values):
+        return self.delimiter.join(values) + "\r\n"
+
+    def serialize(self, instance):
+        attributes = vars(instance)
+        return self._join([encode(attributes[name]) for name, encode in self.fields])
+
+
+def is_binary_file(fileobj):
+    """
+    Return True if fileobj should be written bytes rather than strings. Text streams are
+    TextIOBase instances, or have a mode without "b" (e.g. SpooledTemporaryFile(mode="w+")).
+    Other io objects (e.g. BytesIO) are binary, and anything else is assumed to be text.
+    """
+    if isinstance(fileobj, io.TextIOBase):
+        return False
+    # GzipFile has an int mode, so only string modes are checked.
+    if isinstance(mode := getattr(fileobj, "mode", None), str):
+        return "b" in mode
+    return isinstance(fileobj, io.IOBase)
+
+
+def write_chunked(fileobj, lines, buffer_size=DEFAULT_BUFFER_SIZE, binary=None):
+    """
+    Write an iterable of serialized lines to a text or binary file object, joining them into
+    chunks of around buffer_size characters so there is one write call per chunk. Lines are
+    encoded as UTF-8 if binary is True, or if it is None and is_binary_file(fileobj) is True.
+    Returns the number of lines written.
+    """
+    if binary is None:
+        binary = is_binary_file(fileobj)
+    buffer = []
+    buffered_size = 0
+    line_count = 0
+
+    def _flush():
+        chunk = "".join(buffer)
+        fileobj.write(chunk.encode("utf-8") if binary else chunk)
+        buffer.clear()
+
+    for line in lines:
+        buffer.append(line)
+        buffered_size += len(line)
+        line_count += 1
+        if buffered_size >= buffer_size:
+            _flush()
+            buffered_size = 0
+    if buffer:
+        _flush()
+    return line_count
@@ -0,0 +1,116 @@
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# The installed tracer. Construction only times fields and calls the tracer hooks if this
+# isn't None, so there is no cost beyond this one check when tracing isn't used.
+active_tracer = None
+
+# The code paths a field value can take through the check & cast pipeline.
+PATH_CHECKED = "checked"  # The value passed its type check and was used as it is.
+PATH_TRUSTED = "trusted"  # Type checking was skipped by the validation level.
+PATH_DEFAULT = "default"  # The field was missing and fell back to its default value.
+PATH_MISSING = "missing"  # The field was missing and was set to None.
+PATH_INSTANCE_METHOD = "instance_method"  # Cast by a __cast_<field>__ method.
+PATH_FIELD_FUNCTION = "field_function"  # Cast by a field function in __class_config__.
+PATH_TYPE_FUNCTION = "type_function"  # Cast by a type function in __class_config__.
+PATH_CAST = "cast"  # Cast by the caster compiled from the annotation.
+
+
+class Tracer:
+    """
+    Base class for tracers. Subclass it and override the hooks you need, then install
+    an instance with datacaster.set_tracer.
+
+    start_instance is called before each instance is built, and the other hooks are only
+    called for that instance if it returns True. Durations are in seconds.
+    """
+
+    def start_instance(self, cast_class):
+        return True
+
+    def on_field(self, cast_class, name, path, duration):
+        pass
+
+    def on_instance(self, cast_class, duration):
+        pass
+
+
+class LoggingTracer(Tracer):
+    """
+    Write a log record for every field & instance. The values are passed as logging
+    arguments and in the "datacaster" extra attribute, so nothing is formatted unless the
+    record is emitted, and structured log handlers can read the fields directly.
+    """
+
+    def __init__(self, log=logger, level=logging.DEBUG):
+        self.log = log
+        self.level = level
+
+    def on_field(self, cast_class, name, path, duration):
+        self.log.log(
+            self.level,
+            "%s.%s took path %s in %.6fs",
+            cast_class.__name__,
+            name,
+            path,
+            duration,
+            extra={
+                "datacaster": {
+                    "class": cast_class.__name__,
+                    "field": name,
+                    "path": path,
+                    "duration": duration,
+                }
+            },
+        )
+
+    def on_instance(self, cast_class, duration):
+        self.log.log(
+            self.level,
+            "%s instance built in %.6fs",
+            cast_class.__name__,
+            duration,
+            extra={"datacaster": {"class": cast_class.__name__, "duration": duration}},
+        )
+
+
+class SamplingTracer(Tracer):
+    """
+    Pass 1 in every n instances on to another tracer.
+
+    datacaster.set_tracer(SamplingTracer(LoggingTracer(), 1000))
+    """
+
+    def __init__(self, tracer, n):
+        if n < 1:
+            raise ValueError(f"SamplingTracer n must be at least 1, not {n}.")
+        self.tracer = tracer
+        self.n = n
+        self._counter = itertools.count()
+
+    def start_instance(self, cast_class):
+        return next(self._counter) % self.n == 0 and self.tracer.start_instance(
+            cast_class
+        )
+
+    def on_field(self, cast_class, name, path, duration):
+        self.tracer.on_field(cast_class, name, path, duration)
+
+    def on_instance(self, cast_class, duration):
+        self.tracer.on_instance(cast_class, duration)
+
+
+def set_tracer(tracer):
+    """
+    Install a tracer for every CastDataClass, or remove it by passing None. Returns the
+    previously installed tracer.
+    """
+    global active_tracer
+    previous_tracer, active_tracer = active_tracer, tracer
+    return previous_tracer
+
+
+def get_tracer():
+    return active_tracer
@@ -0,0 +1,115 @@
+import collections
+import itertools
+import random
+
+from . import exceptions
+
+# Type check every field of every record (the default).
+FULL = "full"
+
+# Skip type checks for fields without a cast function, trusting their values and using them
+# as they are. Fields with a cast function are checked and cast as with FULL, and fields in
+# "always_cast" are always cast.
+CAST_ONLY = "cast_only"
+
+
+class Sampled:
+    """
+    A validation level that fully checks a subset of records and trusts the rest (as
+    CAST_ONLY would). Records are picked at random at the given rate, or every Nth record
+    when every_nth is True (N being 1 / rate).
+
+    Fields that fail their type check in a checked record are recorded as violations, so
+    feeds that start drifting away from their expected types can be alerted on. Checked
+    records are cast exactly as they would be with FULL validation.
+
+    class User(CastDataClass):
+        __class_config__ = {"validation": sampled(0.01)}
+    """
+
+    def __init__(self, rate, every_nth=False, max_violations=100):
+        if not 0 < rate <= 1:
+            raise exceptions.InvalidValidationLevel(
+                f"Sample rate must be greater than 0 and no more than 1, not {rate}."
+            )
+        self.rate = rate
+        self.every_nth = every_nth
+        self.record_count = 0
+        self.checked_count = 0
+        self.violation_count = 0
+        # Only the most recent (class name, field, value type) violations are kept.
+        self.violations = collections.deque(maxlen=max_violations)
+        self._interval = round(1 / rate)
+        self._counter = itertools.count()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(rate={self.rate}, every_nth={self.every_nth}, "
+            f"checked={self.checked_count}, violations={self.violation_count})"
+        )
+
+    def should_check(self):
+        self.record_count += 1
+        if self.every_nth:
+            check = next(self._counter) % self._interval == 0
+        else:
+            check = random.random() < self.rate
+        if check:
+            self.checked_count += 1
+        return check
+
+    def record_violation(self, cast_class, field_name, value):
+        self.violation_count += 1
+        self.violations.append((cast_class.__name__, field_name, type(value)))
+
+
+def sampled(rate, every_nth=False, max_violations=100):
+    return Sampled(rate, every_nth=every_nth, max_violations=max_violations)
+
+
+def should_check_types(level):
+    """
+    Return True if the next record should be type checked at the given validation level.
+    """
+    if level == FULL:
+        return True
+    if level == CAST_ONLY:
+        return False
+    if isinstance(level, Sampled):
+        return level.should_check()
+    raise exceptions.InvalidValidationLevel(
+        f"Unknown validation level {repr(level)}. Use '{FULL}', '{CAST_ONLY}' or sampled(rate)."
+    )
+
+
+class ValidationResult:
+    """
+    The outcome of validating a batch of records without creating instances.
+
+    mask is a bytearray holding 1 for each valid record and 0 for each invalid one,
+    in the order the records were supplied. errors is a sparse list of
+    (index, field, exception) tuples covering the invalid records only. The field
+    is None for errors that don't belong to a single field (e.g. key collisions).
+    """
+
+    def __init__(self, mask, errors):
+        self.mask = mask
+        self.errors = errors
+
+    def __len__(self):
+        return len(self.mask)
+
+    def __bool__(self):
+        # True only if every record is valid.
+        return 0 not in self.mask
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(records={len(self)}, valid={self.valid_count}, errors={len(self.errors)})"
+
+    @property
+    def valid_count(self):
+        return self.mask.count(1)
+
+    @property
+    def invalid_indexes(self):
+        return [index for index, valid in enumerate(self.mask) if not valid]
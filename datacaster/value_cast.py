@@ -45,5 +45,4 @@ ANNOTATION_CAST_FUNCTIONS = {
 
 
 def cast_simple_type(expected_type, value, name):
-    logger.debug(f"looking for cast function for {expected_type}")
     return ANNOTATION_CAST_FUNCTIONS[repr(expected_type)](value, name)
@@ -26,6 +26,6 @@ setup(
     ],
     install_requires=["typeguard==2.7.1"],
     tests_require=TEST_DEPENDENCIES,
-    extras_require={"test": TEST_DEPENDENCIES},
+    extras_require={"test": TEST_DEPENDENCIES, "numpy": ["numpy"]},
     test_suite="tests",
 )
@@ -0,0 +1,203 @@
+import io
+import pytest
+
+from typing import Optional
+
+from datacaster import exceptions
+from datacaster.batching import BatchCollector, PendingValue, iter_chunks, per_value
+from datacaster.classes import CastDataClass
+
+MANAGER_NAMES = {"cn=a": "Alice", "cn=b": "Bob"}
+
+
+class Resolver:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, values):
+        self.calls.append(list(values))
+        return [MANAGER_NAMES.get(value, value) for value in values]
+
+
+def make_class(resolver, **config):
+    class BatchDataClass(CastDataClass):
+        name: str
+        manager: Optional[str]
+
+        __class_config__ = {
+            "batch_fields": {"manager": resolver},
+            "always_cast": ["manager"],
+            **config,
+        }
+
+    return BatchDataClass
+
+
+RECORDS = [
+    {"name": "one", "manager": "cn=a"},
+    {"name": "two", "manager": "cn=b"},
+    {"name": "three", "manager": "cn=a"},
+    {"name": "four", "manager": "cn=c"},
+]
+
+
+def test_iter_chunks():
+    assert list(iter_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_chunks([], 2)) == []
+
+
+def test_per_value():
+    resolver = Resolver()
+    assert per_value(resolver)("cn=a") == "Alice"
+    assert resolver.calls == [["cn=a"]]
+
+
+def test_collector_resolves_distinct_values():
+    resolver = Resolver()
+    collector = BatchCollector({"manager": resolver})
+    collect = collector.cast_functions["manager"]
+    attribute_dicts = [
+        {"manager": collect(value)} for value in ["cn=a", "cn=b", "cn=a"]
+    ]
+    assert all(isinstance(d["manager"], PendingValue) for d in attribute_dicts)
+
+    assert collector.resolve(attribute_dicts) == [
+        {"manager": "Alice"},
+        {"manager": "Bob"},
+        {"manager": "Alice"},
+    ]
+    assert resolver.calls == [["cn=a", "cn=b"]]
+
+    # Values are cleared once a chunk has been resolved.
+    collector.resolve([])
+    assert len(resolver.calls) == 1
+
+
+def test_collector_unhashable_values():
+    class Unfingerprintable:
+        def __reduce__(self):
+            raise TypeError("nope")
+
+        __hash__ = None
+
+    resolver = lambda values: [type(value).__name__ for value in values]
+    collector = BatchCollector({"field": resolver})
+    collect = collector.cast_functions["field"]
+    attribute_dicts = [{"field": collect(Unfingerprintable())} for _ in range(2)]
+    assert collector.resolve(attribute_dicts) == [{"field": "Unfingerprintable"}] * 2
+
+
+def test_collector_wrong_result_length():
+    collector = BatchCollector({"field": lambda values: values[1:]})
+    attribute_dicts = [{"field": collector.cast_functions["field"]("value")}]
+    with pytest.raises(exceptions.CastFailed):
+        collector.resolve(attribute_dicts)
+
+
+def test_init_calls_per_value():
+    resolver = Resolver()
+    BatchDataClass = make_class(resolver)
+    assert BatchDataClass(**RECORDS[0]).manager == "Alice"
+    assert BatchDataClass(name="none", manager=None).manager is None
+    assert resolver.calls == [["cn=a"], [None]]
+
+
+def test_from_records_batches():
+    resolver = Resolver()
+    BatchDataClass = make_class(resolver, batch_size=3)
+    instances = list(BatchDataClass.from_records(RECORDS))
+    assert [instance.manager for instance in instances] == [
+        "Alice",
+        "Bob",
+        "Alice",
+        "cn=c",
+    ]
+    assert instances == [BatchDataClass(**record) for record in RECORDS]
+    assert resolver.calls[:2] == [["cn=a", "cn=b"], ["cn=c"]]
+
+
+def test_from_records_batches_with_cache():
+    resolver = Resolver()
+    BatchDataClass = make_class(resolver, cache=True, batch_size=2)
+    assert [
+        instance.manager for instance in BatchDataClass.from_records(RECORDS[:2])
+    ] == ["Alice", "Bob"]
+    assert resolver.calls == [["cn=a", "cn=b"]]
+
+    # Cache misses in a chunk are built together, and cache hits are never cast again.
+    assert [instance.manager for instance in BatchDataClass.from_records(RECORDS)] == [
+        "Alice",
+        "Bob",
+        "Alice",
+        "cn=c",
+    ]
+    assert resolver.calls == [["cn=a", "cn=b"], ["cn=a", "cn=c"]]
+    assert BatchDataClass.get_cache().hits == 2
+
+
+def test_from_rows_batches():
+    resolver = Resolver()
+    BatchDataClass = make_class(resolver, batch_size=2)
+    rows = [(record["name"], record["manager"]) for record in RECORDS]
+    instances = list(BatchDataClass.from_rows(rows, ["name", "manager"]))
+    assert [instance.manager for instance in instances] == [
+        "Alice",
+        "Bob",
+        "Alice",
+        "cn=c",
+    ]
+    assert resolver.calls == [["cn=a", "cn=b"], ["cn=a", "cn=c"]]
+
+
+def test_to_frame_and_iter_ldif_batch():
+    resolver = Resolver()
+    BatchDataClass = make_class(resolver)
+    frame = BatchDataClass.to_frame(RECORDS)
+    assert list(frame.column("manager")) == ["Alice", "Bob", "Alice", "cn=c"]
+    assert resolver.calls == [["cn=a", "cn=b", "cn=c"]]
+
+    ldif_file = io.BytesIO(
+        b"dn: cn=one\nname: one\nmanager: cn=a\n\ndn: cn=two\nname: two\nmanager: cn=a\n"
+    )
+    assert [user.manager for user in BatchDataClass.iter_ldif(ldif_file)] == [
+        "Alice",
+        "Alice",
+    ]
+    assert resolver.calls[1] == ["cn=a"]
+
+
+def test_batch_and_field_function():
+    class DuplicateDataClass(CastDataClass):
+        manager: str
+
+        __class_config__ = {
+            "batch_fields": {"manager": Resolver()},
+            "cast_functions": {"fields": {"manager": lambda value: value}},
+        }
+
+    with pytest.raises(exceptions.MultipleCastDefinitions):
+        DuplicateDataClass(manager="cn=a")
+
+
+def test_validate_many_batches():
+    resolver = Resolver()
+    BatchDataClass = make_class(resolver, batch_size=3)
+    result = BatchDataClass.validate_many(RECORDS)
+    assert result.valid_count == 4
+    assert resolver.calls == [["cn=a", "cn=b"], ["cn=c"]]
+
+
+def test_validate_many_batch_errors():
+    def fail_on_b(values):
+        if "cn=b" in values:
+            raise LookupError("cn=b")
+        return values
+
+    BatchDataClass = make_class(fail_on_b, batch_size=2)
+    result = BatchDataClass.validate_many(RECORDS + [{"manager": "cn=a"}])
+    # The failing call covered the first chunk, so both of its records are invalid.
+    assert result.invalid_indexes == [0, 1]
+    assert [(index, field) for index, field, _ in result.errors] == [
+        (0, "manager"),
+        (1, "manager"),
+    ]
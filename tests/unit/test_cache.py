@@ -0,0 +1,168 @@
+import pytest
+
+from typing import List, Optional
+
+from datacaster.classes import CastDataClass
+from datacaster.cache import (
+    ConstructionCache,
+    UncacheableValue,
+    fingerprint,
+    fingerprint_value,
+)
+from datacaster import exceptions
+
+
+class Unpicklable:
+    __hash__ = None
+
+    def __reduce__(self):
+        raise TypeError("can't pickle me")
+
+
+@pytest.mark.parametrize(
+    "first, second, expected_equal",
+    [
+        ["1", "1", True],
+        ["1", 1, False],
+        [1, True, False],
+        [1, 1.0, False],
+        [[1, "a"], [1, "a"], True],
+        [[1, "a"], (1, "a"), False],
+        [{"a": [1]}, {"a": [1]}, True],
+        [{"a": 1, "b": 2}, {"b": 2, "a": 1}, False],
+        [{1, 2}, {2, 1}, True],
+        [bytearray(b"a"), bytearray(b"a"), True],
+    ],
+)
+def test_fingerprint_value(first, second, expected_equal):
+    assert (fingerprint_value(first) == fingerprint_value(second)) is expected_equal
+    hash(fingerprint_value(first))
+
+
+def test_fingerprint():
+    assert fingerprint({"a": None}, ["a", "b"]) != fingerprint({}, ["a", "b"])
+    assert fingerprint({"a": 1, "extra": 2}, ["a"]) == fingerprint({"a": 1}, ["a"])
+    with pytest.raises(UncacheableValue):
+        fingerprint_value(Unpicklable())
+
+
+def test_construction_cache_lru():
+    cache = ConstructionCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats == {
+        "size": 2,
+        "hits": 2,
+        "misses": 1,
+        "hit_rate": 2 / 3,
+        "evictions": 1,
+        "expirations": 0,
+        "uncacheable": 0,
+    }
+    assert cache.invalidate("a")
+    assert not cache.invalidate("a")
+
+
+def test_construction_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("datacaster.cache.time.monotonic", lambda: now[0])
+    cache = ConstructionCache(ttl=10)
+    cache.set("a", 1)
+    now[0] = 109.0
+    assert cache.get("a") == 1
+    now[0] = 110.0
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert len(cache) == 0
+
+
+def make_cached_class(cache_config):
+    class Cached(CastDataClass):
+        __class_config__ = {
+            "cache": cache_config,
+            "rename_fields": {"Name": "name"},
+        }
+        name: str
+        groups: List[str]
+        age: Optional[int]
+
+    return Cached
+
+
+def test_from_records_cache():
+    Cached = make_cached_class({"max_size": 10})
+    first = list(Cached.from_records([{"Name": "a", "groups": ["x"], "age": "1"}]))
+    second = list(
+        Cached.from_records(
+            [{"name": "a", "groups": ["x"], "age": "1", "extra": object()}]
+        )
+    )
+    assert first[0] is second[0]
+    assert first[0] == Cached(name="a", groups=["x"], age=1)
+    assert Cached(name="a", groups=["x"], age=1) == first[0]
+    assert repr(first[0]) == "Cached(name='a', groups=['x'], age=1)"
+    assert isinstance(first[0], Cached)
+    assert Cached.get_cache().hits == 1
+    with pytest.raises(exceptions.FrozenInstance):
+        first[0].name = "b"
+
+    # The type of each value is part of the fingerprint.
+    third = next(Cached.from_records([{"name": "a", "groups": ["x"], "age": 1}]))
+    assert third is not first[0]
+    assert third == first[0]
+
+
+def test_cache_invalidation():
+    Cached = make_cached_class({"freeze": False})
+    record = {"name": "a", "groups": ["x"]}
+    first = next(Cached.from_records([record]))
+    first.name = "changed"
+    Cached.invalidate_cache(record)
+    assert next(Cached.from_records([record])).name == "a"
+    Cached.invalidate_cache()
+    assert len(Cached.get_cache()) == 0
+
+
+def test_uncacheable_records():
+    Cached = make_cached_class(True)
+    record = {"name": Unpicklable()}
+    assert next(Cached.from_records([record])).name.startswith("<")
+    assert Cached.get_cache().uncacheable == 1
+    assert len(Cached.get_cache()) == 0
+
+
+def test_cache_not_configured():
+    class NotCached(CastDataClass):
+        name: str
+
+    assert NotCached.get_cache() is None
+    first = next(NotCached.from_records([{"name": "a"}]))
+    assert first is not next(NotCached.from_records([{"name": "a"}]))
+    first.name = "b"
+
+
+class PickledCached(CastDataClass):
+    __class_config__ = {"cache": True}
+
+    name: str
+    groups: List[str]
+
+
+def test_frozen_instance_pickle():
+    import pickle
+
+    cached = next(PickledCached.from_records([{"name": "a", "groups": "x"}]))
+    unpickled = pickle.loads(pickle.dumps(cached))
+    assert unpickled == cached
+    assert type(unpickled) is type(cached) is PickledCached._get_frozen_class()
+    with pytest.raises(exceptions.FrozenInstance):
+        unpickled.name = "b"
+
+    # Cached instances of a projection pickle too.
+    Projected = PickledCached.project("name")
+    projected = next(Projected.from_records([{"name": "a", "groups": "x"}]))
+    assert type(pickle.loads(pickle.dumps(projected))) is Projected._get_frozen_class()
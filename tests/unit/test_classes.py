@@ -394,3 +394,284 @@ def test_rename_fields():
         "missing_new_name": "Hello!",
         "new_bool": False,
     }
+
+
+def test_case_insensitive_keys():
+    class CaseInsensitive(CastDataClass):
+        __class_config__ = {"case_insensitive_keys": True}
+        mail: str
+        sAMAccountName: str
+
+    assert CaseInsensitive(MAIL="a@b.com", samaccountname="abc").__dict__ == {
+        "mail": "a@b.com",
+        "sAMAccountName": "abc",
+    }
+    assert CaseInsensitive(Mail="a@b.com", extra="hello").__dict__ == {
+        "mail": "a@b.com",
+        "sAMAccountName": None,
+    }
+
+
+def test_field_aliases():
+    class Aliased(CastDataClass):
+        IGNORE_EXTRA = False
+
+        __class_config__ = {
+            "case_insensitive_keys": True,
+            "field_aliases": {"mail": ["emailAddress", "userPrincipalName"]},
+            "rename_fields": {"Surname": "sn"},
+        }
+        mail: str
+        sn: str
+
+    assert Aliased(EmailAddress="a@b.com", surname="adams").__dict__ == {
+        "mail": "a@b.com",
+        "sn": "adams",
+    }
+    assert Aliased(userprincipalname="a@b.com").__dict__ == {
+        "mail": "a@b.com",
+        "sn": None,
+    }
+    with pytest.raises(exceptions.UnexpectedArgument):
+        Aliased(mail="a@b.com", extra="hello")
+
+
+def test_key_collisions():
+    class Aliased(CastDataClass):
+        __class_config__ = {
+            "case_insensitive_keys": True,
+            "field_aliases": {"mail": ["emailAddress"]},
+        }
+        mail: str
+
+    class CollidingFields(CastDataClass):
+        __class_config__ = {"case_insensitive_keys": True}
+        mail: str
+        Mail: str
+
+    class CollidingAlias(CastDataClass):
+        __class_config__ = {"field_aliases": {"mail": ["name"]}}
+        mail: str
+        name: str
+
+    with pytest.raises(exceptions.KeyCollision):
+        Aliased(mail="a@b.com", MAIL="a@b.com")
+    with pytest.raises(exceptions.KeyCollision):
+        Aliased(mail="a@b.com", emailAddress="a@b.com")
+    with pytest.raises(exceptions.KeyCollision):
+        CollidingFields(mail="a@b.com")
+    with pytest.raises(exceptions.KeyCollision):
+        CollidingAlias(mail="a@b.com")
+
+
+def test_from_rows():
+    rows = [(123, "123", "1.0", "a", "1"), ("abc", 1, 2, ["b", "c"], (1, 2))]
+    columns = ["string", "integer", "floating", "list_string", "tuple_int"]
+
+    instances = list(SimpleDataClass.from_rows(rows, columns))
+    assert instances == [SimpleDataClass(**dict(zip(columns, row))) for row in rows]
+    assert repr(instances[0]) == repr(SimpleDataClass(**dict(zip(columns, rows[0]))))
+    assert vars(instances[1]) == {
+        "string": "abc",
+        "integer": 1,
+        "floating": 2.0,
+        "list_string": ["b", "c"],
+        "tuple_int": (1, 2),
+        "optional_string": None,
+    }
+
+
+def test_from_row_missing_and_renamed():
+    class Renamed(CastDataClass):
+        SET_MISSING_NONE = False
+
+        new_name: int
+        missing_with_default: str = "Hello!"
+
+        __class_config__ = {"rename_fields": {"OriginalName": "new_name"}}
+
+    assert vars(Renamed.from_row(("1", "ignored"), ["OriginalName", "extra"])) == {
+        "missing_with_default": "Hello!",
+        "new_name": 1,
+    }
+    with pytest.raises(exceptions.MissingArgument):
+        Renamed.from_row(("Hello!",), ["missing_with_default"])
+    with pytest.raises(exceptions.KeyCollision):
+        Renamed.from_row(("1", "2"), ["OriginalName", "new_name"])
+
+
+def test_from_rows_extra():
+    class DisallowExtra(CastDataClass):
+        IGNORE_EXTRA = False
+
+        integer: int
+
+    with pytest.raises(exceptions.UnexpectedArgument):
+        list(DisallowExtra.from_rows([(1, 2)], ["integer", "extra"]))
+
+
+def test_from_rows_short_row():
+    columns = ["string", "integer", "floating"]
+    rows = [("a", "1", "1.5"), ("b", "2")]
+    instances = SimpleDataClass.from_rows(rows, columns)
+    assert next(instances).string == "a"
+    with pytest.raises(exceptions.InvalidRow, match=r"Row 1 .*\['floating'\]"):
+        next(instances)
+
+
+def test_validate_many():
+    class Strict(CastDataClass):
+        IGNORE_EXTRA = False
+        SET_MISSING_NONE = False
+
+        integer: int
+        list_string: List[str]
+        optional_string: Optional[str] = None
+
+        __class_config__ = {"case_insensitive_keys": True}
+
+    result = Strict.validate_many(
+        [
+            {"integer": 1, "list_string": ["a"]},
+            {"INTEGER": "1", "list_string": "a", "optional_string": 2},
+            {"integer": "one", "list_string": ["a"]},
+            {"list_string": ["a"], "extra": True},
+            {"integer": 1, "Integer": 1, "list_string": ["a"]},
+        ]
+    )
+    assert result.mask == bytearray([1, 1, 0, 0, 0])
+    assert not result
+    assert len(result) == 5
+    assert result.valid_count == 2
+    assert result.invalid_indexes == [2, 3, 4]
+    assert [(index, field, type(error)) for index, field, error in result.errors] == [
+        (2, "integer", exceptions.CastFailed),
+        (3, "extra", exceptions.UnexpectedArgument),
+        (3, "integer", exceptions.MissingArgument),
+        (4, None, exceptions.KeyCollision),
+    ]
+
+
+def test_validate_many_skips_casting():
+    cast_values = []
+
+    class Counted(CastDataClass):
+        __class_config__ = {
+            "cast_functions": {"fields": {"integer": lambda x: cast_values.append(x)}}
+        }
+        integer: int
+        default_string: str = 123
+
+    result = Counted.validate_many(
+        [{"integer": 1, "default_string": "a"}, {"integer": "1"}]
+    )
+    assert cast_values == ["1"]
+    assert result.mask == bytearray([1, 0])
+    assert [(index, field, type(error)) for index, field, error in result.errors] == [
+        (1, "default_string", exceptions.InvalidDefaultValue)
+    ]
+
+
+def test_rich_annotations():
+    import enum
+    from typing import Dict, Literal, Set
+
+    class Status(enum.Enum):
+        ENABLED = "enabled"
+        DISABLED = "disabled"
+
+    class Rich(CastDataClass):
+        counts: Dict[str, int]
+        tags: Set[str]
+        optional_ints: List[Optional[int]]
+        kind: Literal["user", "group"]
+        status: Status
+        ids: Tuple[int, ...]
+
+    assert vars(
+        Rich(
+            counts={"a": "1"},
+            tags=["x", "x", 1],
+            optional_ints=["1", None],
+            kind="user",
+            status="disabled",
+            ids=["1", 2],
+        )
+    ) == {
+        "counts": {"a": 1},
+        "tags": {"x", "1"},
+        "optional_ints": [1, None],
+        "kind": "user",
+        "status": Status.DISABLED,
+        "ids": (1, 2),
+    }
+    with pytest.raises(exceptions.CastFailed):
+        Rich(kind="computer")
+
+
+class ProjectedParent(CastDataClass):
+    name: str
+    mail: Optional[str] = "unknown"
+    count: int
+    groups: List[str]
+
+    __class_config__ = {
+        "rename_fields": {"sAMAccountName": "name"},
+        "cast_functions": {"fields": {"count": lambda value: len(value)}},
+    }
+    IGNORE_EXTRA = False
+
+    def __cast_groups__(self, value):
+        return value.split(";")
+
+
+def test_project():
+    Projected = ProjectedParent.project("name", "mail", "groups")
+    assert list(Projected.__annotations__) == ["name", "mail", "groups"]
+    assert ProjectedParent.project("groups", "name", "mail") is Projected
+    assert issubclass(Projected, ProjectedParent)
+
+    # Fields outside the projection are skipped without being checked or cast.
+    instance = Projected(sAMAccountName="user", count=object(), groups="a;b")
+    assert vars(instance) == {"mail": "unknown", "name": "user", "groups": ["a", "b"]}
+
+    with pytest.raises(exceptions.UnexpectedArgument):
+        Projected(name="user", groups=[], extra=1)
+
+    Counted = ProjectedParent.project("count")
+    assert Counted(count="abc").count == 3
+    assert list(Counted.from_rows([["x", "ab"]], ["name", "count"]))[0].count == 2
+    assert Counted.project("count") is Counted
+
+    with pytest.raises(exceptions.UnknownField):
+        ProjectedParent.project("name", "missing")
+
+
+class CaseInsensitiveParent(CastDataClass):
+    name: str
+    mail: str
+
+    __class_config__ = {"case_insensitive_keys": True}
+    IGNORE_EXTRA = False
+
+
+def test_project_case_insensitive_keys():
+    Projected = CaseInsensitiveParent.project("name")
+    assert vars(Projected(NAME="a", MAIL="x")) == {"name": "a"}
+    with pytest.raises(exceptions.UnexpectedArgument):
+        Projected(NAME="a", OTHER="x")
+
+
+def test_project_pickle():
+    import pickle
+
+    Projected = ProjectedParent.project("name", "groups")
+    instance = Projected(name="user", groups="a;b")
+    unpickled = pickle.loads(pickle.dumps(instance))
+    assert type(unpickled) is Projected
+    assert unpickled == instance
+
+    # Projections of a projection are made from the original class, so they pickle too.
+    Name = Projected.project("name")
+    assert Name is ProjectedParent.project("name")
+    assert type(pickle.loads(pickle.dumps(Name(name="user")))) is Name
@@ -0,0 +1,147 @@
+import enum
+import pytest
+
+from typing import Any, Callable, Dict, FrozenSet, List, Literal, Optional, Set, Tuple
+
+from datacaster import compiler, exceptions
+from datacaster.classes import CastDataClass
+
+
+class Colour(enum.Enum):
+    RED = 1
+    GREEN = 2
+
+
+@pytest.mark.parametrize(
+    "annotation, value, expected_result",
+    [
+        [str, "hello", True],
+        [int, "1", False],
+        [Any, object(), True],
+        [Optional[int], None, True],
+        [Optional[int], 1.0, False],
+        [float, 1, True],
+        [Optional[float], 1, True],
+        [complex, 1.5, True],
+        [float, "1", False],
+        [List[Optional[int]], [1, None], True],
+        [List[Optional[int]], [1, "2"], False],
+        [Set[str], {"a"}, True],
+        [Set[str], ["a"], False],
+        [FrozenSet[int], frozenset([1]), True],
+        [Dict[str, int], {"a": 1}, True],
+        [Dict[str, int], {"a": "1"}, False],
+        [Tuple[int], (1,), True],
+        [Tuple[int], (1, 2), False],
+        [Tuple[int, ...], (1, 2), True],
+        [Tuple[int, str], (1, "a"), True],
+        [Tuple[int, str], (1, 2), False],
+        [Literal["a", 1], 1, True],
+        [Literal["a", 1], True, False],
+        [Literal["a", 1], [], False],
+        [Colour, Colour.RED, True],
+        [Colour, 1, False],
+    ],
+)
+def test_compile_checker(annotation, value, expected_result):
+    assert compiler.compile_checker(annotation)(value) is expected_result
+
+
+@pytest.mark.parametrize(
+    "annotation",
+    [List, Callable[[int], int], List[Callable[[int], int]], "ForwardReference"],
+    ids=["bare_list", "callable", "list_of_callable", "forward_reference"],
+)
+def test_compile_checker_unsupported(annotation):
+    assert compiler.compile_checker(annotation) is None
+
+
+@pytest.mark.parametrize(
+    "annotation, value, expected_output",
+    [
+        [int, "1", 1],
+        [Optional[float], "1.5", 1.5],
+        [List[Optional[int]], [None, "1", 2.0], [None, 1, 2]],
+        [List[str], "sales", ["sales"]],
+        [Set[str], [1, 2, 2], {"1", "2"}],
+        [Dict[str, int], {1: "2"}, {"1": 2}],
+        [Dict[str, List[int]], {"a": "1"}, {"a": [1]}],
+        [Tuple[int, ...], ["1", "2"], (1, 2)],
+        [Tuple[int, str], ["1", 2], (1, "2")],
+        [Literal[1, 2], "2", 2],
+        [Literal["a", Colour.GREEN], 2, Colour.GREEN],
+        [Colour, 1, Colour.RED],
+        [Colour, "GREEN", Colour.GREEN],
+    ],
+)
+def test_compile_caster(annotation, value, expected_output):
+    assert compiler.compile_caster(annotation, "field")(value) == expected_output
+
+
+@pytest.mark.parametrize(
+    "annotation, value, expected_exception",
+    [
+        [bytes, 1, exceptions.UnsupportedCast],
+        [Optional[bytes], 1, exceptions.UnsupportedCast],
+        [Dict[str, int], "a", exceptions.CastFailed],
+        [Tuple[int, str], (1, 2, 3), exceptions.CastFailed],
+        [Literal[1, 2], "3", exceptions.CastFailed],
+        [Colour, "BLUE", exceptions.CastFailed],
+        [List[int], ["one"], exceptions.CastFailed],
+    ],
+)
+def test_compile_caster_failures(annotation, value, expected_exception):
+    with pytest.raises(expected_exception):
+        compiler.compile_caster(annotation, "field")(value)
+
+
+def test_compile_field_falls_back_to_typeguard():
+    checker, caster = compiler.compile_field("field", Callable[[int], int])
+    assert checker(lambda x: x)
+    assert not checker(1)
+    with pytest.raises(exceptions.UnsupportedCast):
+        caster(1)
+
+
+@pytest.mark.parametrize(
+    "annotation, value, expected_output, expected_types",
+    [
+        [Tuple[int], False, (0,), [int]],
+        [List[int], [True, "2"], [1, 2], [int, int]],
+        [List[float], [1, "2"], [1.0, 2.0], [float, float]],
+        [Tuple[str, int], [1, True], ("1", 1), [str, int]],
+    ],
+)
+def test_compile_caster_casts_every_item(
+    annotation, value, expected_output, expected_types
+):
+    # Once a collection fails its check, every str/int/float item is cast, even if it passes
+    # its own check (a bool is an int), as the pre-compiled pipeline did.
+    output = compiler.compile_caster(annotation, "field")(value)
+    assert output == expected_output
+    assert [type(item) for item in output] == expected_types
+
+
+def test_bytearray_accepted_for_bytes():
+    class Binary(CastDataClass):
+        data: bytes
+        optional_data: Optional[bytes]
+
+    view = memoryview(b"b")
+    binary = Binary(data=bytearray(b"a"), optional_data=view)
+    assert binary.data == bytearray(b"a")
+    assert binary.optional_data is view
+
+
+def test_int_accepted_for_float():
+    class Numbers(CastDataClass):
+        floating: float
+        optional_floating: Optional[float]
+        default_floating: float = 1
+
+    numbers = Numbers(floating=1, optional_floating=2)
+    # Supplied values & defaults are checked the same way as typeguard, so ints aren't cast.
+    assert type(numbers.floating) is int
+    assert type(numbers.optional_floating) is int
+    assert type(numbers.default_floating) is int
+    assert type(Numbers(floating="1.5", optional_floating=None).floating) is float
@@ -0,0 +1,141 @@
+import sys
+import pytest
+
+from typing import Optional, List
+
+from datacaster.classes import CastDataClass
+from datacaster.frame import ArrayColumn, CastFrame, CastFrameRow, get_array_typecode
+
+
+class FrameDataClass(CastDataClass):
+    string: str
+    integer: int
+    optional_integer: Optional[int]
+    floating: float
+    list_string: List[str]
+
+
+RECORDS = [
+    {
+        "string": "a",
+        "integer": "1",
+        "optional_integer": 10,
+        "floating": 1,
+        "list_string": "x",
+    },
+    {
+        "string": 2,
+        "integer": 2,
+        "floating": "2.5",
+        "list_string": ["y", "z"],
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "annotation, expected_typecode",
+    [
+        [int, "q"],
+        [float, "d"],
+        [Optional[int], "q"],
+        [Optional[float], "d"],
+        [str, None],
+        [bool, None],
+        [List[int], None],
+    ],
+    ids=["int", "float", "optional_int", "optional_float", "str", "bool", "list_int"],
+)
+def test_get_array_typecode(annotation, expected_typecode):
+    assert get_array_typecode(annotation) == expected_typecode
+
+
+def test_array_column():
+    column = ArrayColumn("q")
+    assert column.append(1)
+    assert column.nulls is None
+    assert column.append(None)
+    assert not column.append(True)
+    assert not column.append(2**64)
+    assert list(column) == [1, None]
+    assert column.nulls == bytearray([0, 1])
+
+    column = ArrayColumn("d")
+    assert column.append(1)
+    assert not column.append(2**53 + 1)
+    assert list(column) == [1.0]
+    assert column[0].__class__ is float
+
+
+def test_frame_columns():
+    frame = FrameDataClass.to_frame(RECORDS)
+    assert len(frame) == 2
+    assert isinstance(frame.column("integer"), ArrayColumn)
+    assert isinstance(frame.column("floating"), ArrayColumn)
+    assert isinstance(frame.column("string"), list)
+    assert list(frame.column("optional_integer")) == [10, None]
+    assert frame.to_dicts() == [vars(FrameDataClass(**record)) for record in RECORDS]
+
+
+def test_frame_rows():
+    frame = FrameDataClass.to_frame(RECORDS)
+    row = frame[-1]
+    assert isinstance(row, CastFrameRow)
+    assert row.string == "2"
+    assert row.floating == 2.5
+    assert row.optional_integer is None
+    assert repr(row) == repr(FrameDataClass(**RECORDS[1]))
+    assert row.to_instance() == FrameDataClass(**RECORDS[1])
+    assert [row.list_string for row in frame] == [["x"], ["y", "z"]]
+    assert frame.to_instances() == [FrameDataClass(**record) for record in RECORDS]
+    with pytest.raises(IndexError):
+        frame[2]
+    with pytest.raises(AttributeError):
+        row.missing
+
+
+def test_frame_falls_back_to_list():
+    class CastToString(CastDataClass):
+        __class_config__ = {"cast_functions": {"fields": {"integer": lambda x: str(x)}}}
+        integer: int
+
+    frame = CastToString.to_frame([{"integer": 1}, {"integer": "2"}, {"integer": 3}])
+    assert frame.column("integer") == [1, "2", 3]
+
+
+def test_frame_from_instances():
+    instances = [FrameDataClass(**record) for record in RECORDS]
+    frame = CastFrame.from_instances(FrameDataClass, instances)
+    assert frame.to_instances() == instances
+
+
+def test_frame_memory_savings():
+    class Numeric(CastDataClass):
+        first: int
+        second: Optional[int]
+        third: float
+
+    records = [{"first": i, "second": i * 2, "third": i / 2} for i in range(1000)]
+    instances = [Numeric(**record) for record in records]
+    frame = Numeric.to_frame(records)
+
+    # Each instance holds a __dict__ plus an int/float object per field.
+    instance_bytes = sum(
+        sys.getsizeof(instance)
+        + sys.getsizeof(vars(instance))
+        + sum(sys.getsizeof(value) for value in vars(instance).values())
+        for instance in instances
+    )
+    assert frame.nbytes * 5 < instance_bytes
+
+
+def test_to_numpy():
+    numpy = pytest.importorskip("numpy")
+    frame = FrameDataClass.to_frame(RECORDS)
+
+    integers = frame.to_numpy("integer")
+    assert integers.tolist() == [1, 2]
+    assert numpy.shares_memory(
+        integers, numpy.frombuffer(frame.column("integer").values, dtype="int64")
+    )
+    assert frame.to_numpy("optional_integer").mask.tolist() == [False, True]
+    assert frame.to_numpy("string").tolist() == ["a", "2"]
@@ -0,0 +1,154 @@
+import base64
+import io
+import pytest
+
+from typing import Any, List, Optional
+
+from datacaster.classes import CastDataClass
+from datacaster import exceptions, ldif
+
+SID = b"\x01\x05\x00\x00\x00\x00\x00\x05\x15\x00\x00\x00\xff"
+
+LDIF = (
+    b"version: 1\r\n"
+    b"\r\n"
+    b"# a comment that is\r\n"
+    b"  folded\r\n"
+    b"dn: CN=Duck Adams,OU=Users,DC=example,DC=com\r\n"
+    b"objectClass: top\r\n"
+    b"objectClass: person\r\n"
+    b"objectclass: user\r\n"
+    b"sAMAccountName: dadams\r\n"
+    b"description: a long description which has been\r\n"
+    b"  folded over two lines\r\n"
+    b"displayName:: " + base64.b64encode("Duck Ädams".encode("utf-8")) + b"\r\n"
+    b"objectSid:: " + base64.b64encode(SID) + b"\r\n"
+    b"logonCount: 12\r\n"
+    b"memberOf: CN=Sales,DC=example,DC=com\r\n"
+    b"\r\n"
+    b"\r\n"
+    b"dn: CN=Jo Bloggs,OU=Users,DC=example,DC=com\r\n"
+    b"sAMAccountName: jbloggs\r\n"
+    b"jpegPhoto:< file:///tmp/photo.jpg\r\n"
+    b"logonCount: 3"
+)
+
+
+class LDIFUser(CastDataClass):
+    __class_config__ = {
+        "rename_fields": {"dn": "distinguishedName"},
+        "case_insensitive_keys": True,
+        "cast_functions": {"fields": {"objectSid": lambda x: x.hex()}},
+    }
+    distinguishedName: str
+    objectClass: List[str]
+    sAMAccountName: str
+    displayName: Optional[str]
+    objectSid: Optional[str]
+    logonCount: int
+    memberOf: List[str]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_iter_ldif_entries(chunk_size):
+    entries = list(ldif.iter_ldif_entries(io.BytesIO(LDIF), chunk_size))
+    assert entries == [
+        {
+            "dn": "CN=Duck Adams,OU=Users,DC=example,DC=com",
+            "objectClass": ["top", "person", "user"],
+            "sAMAccountName": "dadams",
+            "description": "a long description which has been folded over two lines",
+            "displayName": "Duck Ädams".encode("utf-8"),
+            "objectSid": SID,
+            "logonCount": "12",
+            "memberOf": "CN=Sales,DC=example,DC=com",
+        },
+        {
+            "dn": "CN=Jo Bloggs,OU=Users,DC=example,DC=com",
+            "sAMAccountName": "jbloggs",
+            "jpegPhoto": "file:///tmp/photo.jpg",
+            "logonCount": "3",
+        },
+    ]
+
+
+def test_iter_ldif_entries_text_file():
+    text = LDIF.decode("utf-8").replace("\r\n", "\n")
+    assert list(ldif.iter_ldif_entries(io.StringIO(text))) == list(
+        ldif.iter_ldif_entries(io.BytesIO(LDIF))
+    )
+
+
+@pytest.mark.parametrize(
+    "ldif_bytes",
+    [b" continuation\n", b"dn: a\nno separator\n", b"dn: a\nattr:: not base64!\n"],
+    ids=["continuation_first", "no_separator", "invalid_base64"],
+)
+def test_invalid_ldif(ldif_bytes):
+    with pytest.raises(exceptions.InvalidLDIF):
+        list(ldif.iter_ldif_entries(io.BytesIO(ldif_bytes)))
+
+
+def test_iter_ldif():
+    users = list(LDIFUser.iter_ldif(io.BytesIO(LDIF), chunk_size=16))
+    assert vars(users[0]) == {
+        "distinguishedName": "CN=Duck Adams,OU=Users,DC=example,DC=com",
+        "objectClass": ["top", "person", "user"],
+        "sAMAccountName": "dadams",
+        "displayName": "Duck Ädams",
+        "objectSid": SID.hex(),
+        "logonCount": 12,
+        "memberOf": ["CN=Sales,DC=example,DC=com"],
+    }
+    assert vars(users[1]) == {
+        "distinguishedName": "CN=Jo Bloggs,OU=Users,DC=example,DC=com",
+        "objectClass": None,
+        "sAMAccountName": "jbloggs",
+        "displayName": None,
+        "objectSid": None,
+        "logonCount": 3,
+        "memberOf": None,
+    }
+
+
+def test_iter_ldif_uses_annotations():
+    # A SID that is also valid UTF-8.
+    utf8_sid = bytes.fromhex("01020000000000052000000020020000")
+
+    class Group(CastDataClass):
+        __class_config__ = {"case_insensitive_keys": True}
+        dn: str
+        cn: str
+        member: Optional[List[str]]
+        objectSid: bytes
+        description: Any
+
+        def __cast_cn__(self, value):
+            return value[0] if isinstance(value, list) else value
+
+    def group_ldif(*lines):
+        return io.BytesIO(
+            b"dn: CN=Sales,DC=example,DC=com\n"
+            b"objectSid:: " + base64.b64encode(utf8_sid) + b"\n" + b"".join(lines)
+        )
+
+    (group,) = Group.iter_ldif(
+        group_ldif(
+            b"cn: Sales\n",
+            b"cn: Sales Team\n",
+            b"member:: " + base64.b64encode("CN=Duck Ädams".encode("utf-8")) + b"\n",
+            b"description:: " + base64.b64encode(b"desc") + b"\n",
+        )
+    )
+    assert vars(group) == {
+        "dn": "CN=Sales,DC=example,DC=com",
+        "cn": "Sales",
+        "member": ["CN=Duck Ädams"],
+        "objectSid": utf8_sid,
+        "description": b"desc",
+    }
+
+    with pytest.raises(exceptions.MultipleValues):
+        list(Group.iter_ldif(group_ldif(b"dn: CN=Other,DC=example,DC=com\n")))
+    with pytest.raises(exceptions.InvalidLDIF):
+        list(Group.iter_ldif(group_ldif(b"member:: " + base64.b64encode(SID) + b"\n")))
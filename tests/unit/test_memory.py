@@ -0,0 +1,82 @@
+import sys
+import pytest
+
+from typing import Optional, List
+
+from datacaster.classes import CastDataClass
+from datacaster import memory
+
+
+class MemoryDataClass(CastDataClass):
+    name: str
+    count: Optional[int]
+    memberOf: List[str]
+
+
+RECORDS = [
+    {"name": f"user{i}", "count": i, "memberOf": [f"group{i}-{j}" for j in range(10)]}
+    for i in range(50)
+]
+
+
+def test_deep_sizeof():
+    shared = "shared string value"
+    value = {"a": [shared, shared], "b": (1, 2)}
+    seen = set()
+    size = memory.deep_sizeof(value, seen)
+    assert size >= sys.getsizeof(value) + sys.getsizeof(shared)
+    assert memory.deep_sizeof(shared, seen) == 0
+    assert memory.deep_sizeof(value, set()) == size
+
+
+def test_footprint_instance():
+    instance = MemoryDataClass(**RECORDS[0])
+    instance_footprint = memory.footprint(instance)
+    assert instance_footprint.instance_count == 1
+    assert set(instance_footprint.field_bytes) == {"name", "count", "memberOf"}
+    assert instance_footprint.largest_fields(1)[0][0] == "memberOf"
+    assert instance_footprint.total_bytes == instance_footprint.per_instance_bytes
+
+
+def test_footprint_deduplicates_shared_values():
+    groups = [f"group{j}" for j in range(10)]
+    shared = [MemoryDataClass(name="a", count=1, memberOf=groups) for _ in range(10)]
+    separate = [
+        MemoryDataClass(name="a", count=1, memberOf=list(groups)) for _ in range(10)
+    ]
+    assert (
+        memory.footprint(shared).field_bytes["memberOf"]
+        < memory.footprint(separate).field_bytes["memberOf"]
+    )
+
+
+def test_footprint_frame():
+    frame = MemoryDataClass.to_frame(RECORDS)
+    frame_footprint = memory.footprint(frame)
+    assert frame_footprint.instance_count == 50
+    assert frame_footprint.field_bytes["count"] == 50 * 8
+    assert (
+        frame_footprint.total_bytes
+        < memory.footprint(MemoryDataClass(**record) for record in RECORDS).total_bytes
+    )
+
+
+def test_estimate_bytes():
+    sample_bytes = MemoryDataClass.estimate_bytes(RECORDS)
+    assert (
+        sample_bytes
+        == memory.footprint(
+            [MemoryDataClass(**record) for record in RECORDS]
+        ).total_bytes
+    )
+    assert MemoryDataClass.estimate_bytes(RECORDS, count=100) == pytest.approx(
+        sample_bytes * 2, abs=1
+    )
+
+
+def test_measure_peak():
+    instances, peak_bytes = memory.measure_peak(
+        list, (MemoryDataClass(**record) for record in RECORDS)
+    )
+    assert len(instances) == 50
+    assert peak_bytes > 0
@@ -0,0 +1,233 @@
+import asyncio
+import threading
+import time
+import pytest
+
+from datacaster.classes import CastDataClass
+from datacaster import paging
+
+PAGE_COUNT = 5
+PAGE_SIZE = 3
+LATENCY = 0.05
+
+
+class PagedUser(CastDataClass):
+    name: str
+    age: int
+
+
+class FakePagedSource:
+    """
+    A paged API that takes LATENCY seconds to return each page. The token is the
+    number of the page to fetch.
+    """
+
+    def __init__(self, fail_on_page=None):
+        self.fail_on_page = fail_on_page
+        self.fetched_pages = 0
+        self.fetch_started = [threading.Event() for _ in range(PAGE_COUNT)]
+
+    def _page(self, token):
+        page_number = token or 0
+        if page_number == self.fail_on_page:
+            raise ConnectionError(f"page {page_number} failed")
+        records = [
+            {"name": f"user{page_number}-{i}", "age": str(page_number)}
+            for i in range(PAGE_SIZE)
+        ]
+        self.fetched_pages += 1
+        next_token = page_number + 1 if page_number + 1 < PAGE_COUNT else None
+        return records, next_token
+
+    def fetch_page(self, token):
+        self.fetch_started[token or 0].set()
+        time.sleep(LATENCY)
+        return self._page(token)
+
+    async def async_fetch_page(self, token):
+        self.fetch_started[token or 0].set()
+        await asyncio.sleep(LATENCY)
+        return self._page(token)
+
+
+def test_iter_pages():
+    source = FakePagedSource()
+    users = list(PagedUser.iter_pages(source.fetch_page))
+    assert len(users) == PAGE_COUNT * PAGE_SIZE
+    assert users[0] == PagedUser(name="user0-0", age=0)
+    assert users[-1] == PagedUser(name="user4-2", age=4)
+
+
+def test_iter_pages_async():
+    source = FakePagedSource()
+    users = list(PagedUser.iter_pages(source.async_fetch_page, prefetch=2))
+    assert [user.age for user in users] == [
+        page for page in range(PAGE_COUNT) for _ in range(PAGE_SIZE)
+    ]
+
+
+def test_next_page_fetched_while_casting():
+    source = FakePagedSource()
+    users = PagedUser.iter_pages(source.fetch_page)
+    next(users)
+    # The second page is requested while the first one is still being used.
+    assert source.fetch_started[1].wait(timeout=5)
+    assert len(list(users)) == PAGE_COUNT * PAGE_SIZE - 1
+
+
+def test_fetching_overlaps_casting():
+    source = FakePagedSource()
+    start_time = time.perf_counter()
+    for records in paging.iter_prefetched_pages(source.fetch_page):
+        # Simulate casting taking as long as fetching each page.
+        time.sleep(LATENCY)
+    elapsed = time.perf_counter() - start_time
+    # Sequential fetching & casting would take 2 * LATENCY per page.
+    assert elapsed < PAGE_COUNT * 2 * LATENCY * 0.85
+
+
+def test_backpressure():
+    source = FakePagedSource()
+    pages = paging.iter_prefetched_pages(source.fetch_page, prefetch=1)
+    next(pages)
+    time.sleep(LATENCY * 6)
+    # One page in use, prefetch pages waiting in the queue, and one held by the fetcher.
+    assert source.fetched_pages == 1 + 1 + 1
+    pages.close()
+
+
+def test_fetch_errors_raised():
+    source = FakePagedSource(fail_on_page=2)
+    users = PagedUser.iter_pages(source.fetch_page)
+    assert len([next(users) for _ in range(2 * PAGE_SIZE)]) == 2 * PAGE_SIZE
+    with pytest.raises(ConnectionError):
+        next(users)
+
+
+@pytest.mark.parametrize(
+    "error", [asyncio.CancelledError(), SystemExit(1)], ids=["cancelled", "exit"]
+)
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_base_exceptions_raised(error, use_async):
+    def fetch_page(token):
+        raise error
+
+    async def async_fetch_page(token):
+        raise error
+
+    pages = paging.iter_prefetched_pages(async_fetch_page if use_async else fetch_page)
+    result = []
+
+    def consume():
+        try:
+            next(pages)
+        except BaseException as e:
+            result.append(e)
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    consumer.join(timeout=2)
+    assert not consumer.is_alive()
+    assert result == [error]
+
+
+def test_early_close_stops_fetcher():
+    source = FakePagedSource()
+    pages = paging.iter_prefetched_pages(source.fetch_page)
+    next(pages)
+    pages.close()
+    time.sleep(paging.STOP_CHECK_INTERVAL + LATENCY * 3)
+    assert source.fetched_pages < PAGE_COUNT
+
+
+def test_invalid_prefetch():
+    with pytest.raises(ValueError):
+        next(paging.iter_prefetched_pages(lambda token: ([], None), prefetch=0))
+
+
+class AsyncCallableSource(FakePagedSource):
+    async def __call__(self, token):
+        return await self.async_fetch_page(token)
+
+
+def test_iter_pages_async_callable():
+    # iscoroutinefunction is False for objects with an async __call__, so the result is checked.
+    users = list(PagedUser.iter_pages(AsyncCallableSource()))
+    assert len(users) == PAGE_COUNT * PAGE_SIZE
+
+
+async def _collect(users):
+    return [user async for user in users]
+
+
+@pytest.mark.parametrize(
+    "use_async, use_callable",
+    [[True, False], [True, True], [False, False]],
+    ids=["async", "async_callable", "sync"],
+)
+def test_aiter_pages(use_async, use_callable):
+    source = AsyncCallableSource()
+    fetch_threads = []
+    fetch_loops = []
+
+    async def async_fetch_page(token):
+        fetch_loops.append(asyncio.get_running_loop())
+        return await source.async_fetch_page(token)
+
+    def fetch_page(token):
+        fetch_threads.append(threading.current_thread())
+        return source.fetch_page(token)
+
+    if use_callable:
+        fetch = source
+    else:
+        fetch = async_fetch_page if use_async else fetch_page
+
+    async def main():
+        users = await _collect(PagedUser.aiter_pages(fetch, prefetch=2))
+        return users, asyncio.get_running_loop()
+
+    users, loop = asyncio.run(main())
+    assert users == list(PagedUser.iter_pages(FakePagedSource().fetch_page))
+    # Async fetchers run on the caller's loop, and sync fetchers in the loop's executor.
+    assert all(fetch_loop is loop for fetch_loop in fetch_loops)
+    assert threading.main_thread() not in fetch_threads
+
+
+def test_aiter_pages_fetching_overlaps_casting():
+    source = FakePagedSource()
+
+    async def main():
+        async for records in paging.aiter_prefetched_pages(source.async_fetch_page):
+            await asyncio.sleep(LATENCY)
+
+    start_time = time.perf_counter()
+    asyncio.run(main())
+    elapsed = time.perf_counter() - start_time
+    assert elapsed < PAGE_COUNT * 2 * LATENCY * 0.85
+
+
+def test_aiter_pages_errors_raised():
+    source = FakePagedSource(fail_on_page=2)
+
+    async def main():
+        users = PagedUser.aiter_pages(source.async_fetch_page)
+        for _ in range(2 * PAGE_SIZE):
+            await users.__anext__()
+        with pytest.raises(ConnectionError):
+            await users.__anext__()
+
+    asyncio.run(main())
+
+
+def test_aiter_pages_early_close_cancels_fetcher():
+    source = FakePagedSource()
+
+    async def main():
+        pages = paging.aiter_prefetched_pages(source.async_fetch_page)
+        await pages.__anext__()
+        await pages.aclose()
+        await asyncio.sleep(LATENCY * 3)
+
+    asyncio.run(main())
+    assert source.fetched_pages < PAGE_COUNT
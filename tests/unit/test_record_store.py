@@ -0,0 +1,211 @@
+import pytest
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from datacaster import exceptions
+from datacaster.classes import CastDataClass
+from datacaster.record_store import (
+    RecordStore,
+    RecordStoreWriter,
+    StoredRecord,
+    get_field_kind,
+)
+
+
+class StoreDataClass(CastDataClass):
+    string: str
+    integer: int
+    optional_integer: Optional[int]
+    floating: float
+    boolean: bool
+    raw: Optional[bytes]
+    list_string: List[str]
+    tuple_integer: Tuple[int, ...]
+    mapping: Dict[str, int]
+
+
+RECORDS = [
+    {
+        "string": "a",
+        "integer": 1,
+        "optional_integer": 10,
+        "floating": 1.5,
+        "boolean": True,
+        "raw": b"\x00\xff",
+        "list_string": ["x", "ÿ"],
+        "tuple_integer": (1, -2, 3),
+        "mapping": {"a": 1},
+    },
+    {
+        "string": "",
+        "integer": -(2**63),
+        "floating": -0.25,
+        "boolean": False,
+        "list_string": [],
+        "tuple_integer": (),
+        "mapping": {},
+    },
+]
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "records.dcrs"
+    StoreDataClass.write_store(path, StoreDataClass.from_records(RECORDS))
+    return path
+
+
+@pytest.mark.parametrize(
+    "annotation, expected_kind",
+    [
+        [int, "int"],
+        [Optional[float], "float"],
+        [bool, "bool"],
+        [str, "str"],
+        [bytes, "bytes"],
+        [List[str], "list[str]"],
+        [Optional[Tuple[int, ...]], "tuple[int]"],
+        [Tuple[int, str], "pickle"],
+        [Union[int, str], "pickle"],
+        [Dict[str, int], "pickle"],
+        [Any, "pickle"],
+    ],
+    ids=[
+        "int",
+        "optional_float",
+        "bool",
+        "str",
+        "bytes",
+        "list_str",
+        "optional_variadic_tuple",
+        "fixed_tuple",
+        "union",
+        "dict",
+        "any",
+    ],
+)
+def test_get_field_kind(annotation, expected_kind):
+    assert get_field_kind(annotation) == expected_kind
+
+
+def test_round_trip(store_path):
+    with StoreDataClass.open_store(store_path, allow_pickle=True) as store:
+        assert len(store) == 2
+        assert [record.to_instance() for record in store] == list(
+            StoreDataClass.from_records(RECORDS)
+        )
+
+
+def test_random_access(store_path):
+    with StoreDataClass.open_store(store_path, allow_pickle=True) as store:
+        record = store[1]
+        assert isinstance(record, StoredRecord)
+        assert record.integer == -(2**63)
+        assert record.optional_integer is None
+        assert record.raw is None
+        assert store[-2].list_string == ["x", "ÿ"]
+        assert store[0].tuple_integer == (1, -2, 3)
+        assert store.read_field(0, "mapping") == {"a": 1}
+        with pytest.raises(IndexError):
+            store[2]
+        with pytest.raises(AttributeError):
+            record.not_a_field
+
+
+def test_stored_values_are_not_cast_again(tmp_path):
+    class Unchecked(CastDataClass):
+        integer: int
+        strings: List[str]
+
+    instance = Unchecked(integer=1, strings=["a"])
+    instance.integer = "1"
+    instance.strings = ["a", 2]
+
+    path = tmp_path / "unchecked.dcrs"
+    Unchecked.write_store(path, [instance])
+
+    with Unchecked.open_store(path, allow_pickle=True) as store:
+        # Values that don't match the annotation are stored and returned as they are.
+        assert store[0].integer == "1"
+        assert store[0].strings == ["a", 2]
+
+
+def test_streaming_writer(tmp_path):
+    path = tmp_path / "streamed.dcrs"
+    with RecordStoreWriter(path, StoreDataClass) as writer:
+        for instance in StoreDataClass.from_records(RECORDS * 50):
+            writer.write(instance)
+        assert len(writer) == 100
+
+    with RecordStore(path, allow_pickle=True) as store:
+        assert len(store) == 100
+        assert store.class_name == "StoreDataClass"
+        assert store[99].to_dict() == vars(StoreDataClass(**RECORDS[1]))
+        with pytest.raises(TypeError):
+            store[0].to_instance()
+        assert store[0].to_instance(StoreDataClass) == StoreDataClass(**RECORDS[0])
+
+
+def test_schema_mismatch(store_path):
+    class OtherDataClass(CastDataClass):
+        string: int
+
+    with pytest.raises(exceptions.InvalidRecordStore):
+        OtherDataClass.open_store(store_path)
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "invalid.dcrs"
+    path.write_bytes(b"not a record store at all")
+    with pytest.raises(exceptions.InvalidRecordStore):
+        RecordStore(path)
+    path.write_bytes(b"")
+    with pytest.raises(exceptions.InvalidRecordStore):
+        RecordStore(path)
+
+
+def test_disallow_pickle(store_path):
+    with StoreDataClass.open_store(store_path) as store:
+        assert store[0].list_string == ["x", "ÿ"]
+        with pytest.raises(exceptions.UnsafeRecordStore):
+            store[0].mapping
+
+
+def test_ints_in_float_fields(tmp_path):
+    class Floats(CastDataClass):
+        floating: float
+        floats: List[float]
+
+    path = tmp_path / "floats.dcrs"
+    Floats.write_store(
+        path,
+        [
+            Floats(floating=2, floats=[1, 0.5]),
+            Floats(floating=2**53 + 1, floats=[2**53 + 1]),
+        ],
+    )
+
+    with Floats.open_store(path) as store:
+        # Ints that convert to a float exactly are stored as floats, without pickling.
+        assert store[0].floating.__class__ is float
+        assert store[0].to_dict() == {"floating": 2.0, "floats": [1.0, 0.5]}
+        with pytest.raises(exceptions.UnsafeRecordStore):
+            store[1].floating
+        with pytest.raises(exceptions.UnsafeRecordStore):
+            store[1].floats
+
+    with Floats.open_store(path, allow_pickle=True) as store:
+        assert store[1].to_dict() == {"floating": 2**53 + 1, "floats": [2**53 + 1]}
+
+
+def test_failed_write_is_not_readable(tmp_path):
+    def failing_instances():
+        yield from StoreDataClass.from_records(RECORDS)
+        raise RuntimeError("source failed")
+
+    path = tmp_path / "failed.dcrs"
+    with pytest.raises(RuntimeError):
+        StoreDataClass.write_store(path, failing_instances())
+
+    with pytest.raises(exceptions.InvalidRecordStore):
+        StoreDataClass.open_store(path)
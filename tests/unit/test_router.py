@@ -0,0 +1,128 @@
+import io
+import pytest
+
+from typing import List, Optional
+
+from datacaster import exceptions
+from datacaster.classes import CastDataClass
+from datacaster.ldif import iter_ldif_entries
+from datacaster.router import CastRouter
+
+
+class User(CastDataClass):
+    name: str
+    mail: Optional[str]
+
+
+class Computer(CastDataClass):
+    name: str
+    dNSHostName: Optional[str]
+
+
+class Group(CastDataClass):
+    name: str
+    member: List[str]
+
+
+RECORDS = [
+    {"objectClass": ["top", "person", "user"], "name": "alice", "mail": "a@x"},
+    {"objectClass": ["top", "group"], "name": "admins", "member": "cn=alice"},
+    {"objectClass": ["top", "person", "User", "Computer"], "name": "pc1"},
+    {"objectClass": ["top", "printQueue"], "name": "printer"},
+    {"objectClass": "user", "name": "bob"},
+]
+
+
+@pytest.fixture
+def unknown_records():
+    return []
+
+
+@pytest.fixture
+def router(unknown_records):
+    return CastRouter(
+        {"user": User, "computer": Computer, "group": Group},
+        discriminator="objectClass",
+        fallback=unknown_records.append,
+        case_insensitive=True,
+    )
+
+
+def test_route(router):
+    assert [router.route(record) for record in RECORDS] == [
+        User,
+        Group,
+        Computer,
+        None,
+        User,
+    ]
+    assert router.route({"objectClass": [{}, "group"]}) is Group
+    assert router.route({}) is None
+
+
+def test_route_function():
+    router = CastRouter(
+        {"Person": User, "Computer": Computer},
+        discriminator=lambda record: record["objectCategory"].split(",")[0][3:],
+    )
+    assert router.route({"objectCategory": "CN=Computer,CN=Schema"}) is Computer
+    # Without case_insensitive, values must match exactly.
+    assert router.route({"objectCategory": "CN=person,CN=Schema"}) is None
+
+
+def test_cast(router, unknown_records):
+    assert router.cast(RECORDS[2]) == Computer(name="pc1")
+    assert router.cast(RECORDS[3]) is None
+    assert unknown_records == [RECORDS[3]]
+
+
+def test_unknown_without_fallback():
+    router = CastRouter({"user": User}, discriminator="objectClass")
+    with pytest.raises(exceptions.UnknownDiscriminator):
+        router.cast(RECORDS[1])
+    with pytest.raises(exceptions.UnknownDiscriminator):
+        list(router.iter_tagged(RECORDS))
+
+
+def test_to_buckets(router, unknown_records):
+    assert router.to_buckets(RECORDS) == {
+        User: [User(name="alice", mail="a@x"), User(name="bob")],
+        Computer: [Computer(name="pc1")],
+        Group: [Group(name="admins", member=["cn=alice"])],
+    }
+    assert unknown_records == [RECORDS[3]]
+    assert router.to_buckets([]) == {User: [], Computer: [], Group: []}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_iter_tagged(router, unknown_records, chunk_size):
+    assert list(router.iter_tagged(RECORDS, chunk_size=chunk_size)) == [
+        (User, User(name="alice", mail="a@x")),
+        (Group, Group(name="admins", member=["cn=alice"])),
+        (Computer, Computer(name="pc1")),
+        (User, User(name="bob")),
+    ]
+    assert unknown_records == [RECORDS[3]]
+
+
+def test_iter_tagged_ldif(router):
+    ldif_file = io.BytesIO(
+        b"dn: cn=alice\nobjectClass: top\nobjectClass: user\nname: alice\n\n"
+        b"dn: cn=pc1\nobjectClass: user\nobjectClass: computer\nname: pc1\n"
+        b"dNSHostName: pc1.example.com\n"
+    )
+    assert list(router.iter_tagged(iter_ldif_entries(ldif_file))) == [
+        (User, User(name="alice")),
+        (Computer, Computer(name="pc1", dNSHostName="pc1.example.com")),
+    ]
+
+
+def test_case_insensitive_field_name(router):
+    ldif_file = io.BytesIO(b"dn: cn=admins\nobjectclass: group\nname: admins\n")
+    [(cast_class, instance)] = router.iter_tagged(iter_ldif_entries(ldif_file))
+    assert cast_class is Group
+    assert vars(instance) == {"name": "admins", "member": None}
+    assert router.route({"OBJECTCLASS": "Computer"}) is Computer
+
+    case_sensitive = CastRouter({"group": Group}, discriminator="objectClass")
+    assert case_sensitive.route({"objectclass": "group"}) is None
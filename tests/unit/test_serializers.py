@@ -0,0 +1,201 @@
+import csv
+import enum
+import io
+import json
+import pytest
+import tempfile
+
+from typing import Dict, List, Optional, Tuple
+
+from datacaster.classes import CastDataClass
+from datacaster.serializers import (
+    CSVSerializer,
+    JSONLinesSerializer,
+    is_binary_file,
+    write_chunked,
+)
+
+
+class Status(enum.Enum):
+    ENABLED = "enabled"
+
+
+class SerialDataClass(CastDataClass):
+    name: str
+    count: int
+    ratio: Optional[float]
+    enabled: bool
+    groups: List[str]
+    ids: Tuple[int, ...]
+    extra: Dict[str, int]
+    status: Optional[Status]
+
+
+RECORDS = [
+    {
+        "name": 'Smith, "Jo"\nÿ',
+        "count": "3",
+        "ratio": 0.5,
+        "enabled": True,
+        "groups": ["a", "b,c"],
+        "ids": [1, 2],
+        "extra": {"x": 1},
+        "status": "enabled",
+    },
+    {
+        "name": "plain",
+        "count": 0,
+        "enabled": False,
+        "groups": [],
+        "ids": [],
+        "extra": {},
+    },
+]
+
+
+@pytest.fixture
+def instances():
+    return list(SerialDataClass.from_records(RECORDS))
+
+
+def test_jsonl_serializer(instances):
+    serializer = JSONLinesSerializer(SerialDataClass)
+    lines = [serializer.serialize(instance) for instance in instances]
+    assert all(line.endswith("}\n") and line.count("\n") == 1 for line in lines)
+    assert [json.loads(line) for line in lines] == [
+        {
+            "name": 'Smith, "Jo"\nÿ',
+            "count": 3,
+            "ratio": 0.5,
+            "enabled": True,
+            "groups": ["a", "b,c"],
+            "ids": [1, 2],
+            "extra": {"x": 1},
+            "status": "enabled",
+        },
+        {
+            "name": "plain",
+            "count": 0,
+            "ratio": None,
+            "enabled": False,
+            "groups": [],
+            "ids": [],
+            "extra": {},
+            "status": None,
+        },
+    ]
+    # Fields are always written in annotation order.
+    assert list(json.loads(lines[1])) == list(SerialDataClass.__annotations__)
+
+
+def test_jsonl_unexpected_types(instances):
+    instances[0].count = "not an int"
+    instances[0].groups = ["a", 1]
+    line = JSONLinesSerializer(SerialDataClass).serialize(instances[0])
+    assert json.loads(line)["count"] == "not an int"
+    assert json.loads(line)["groups"] == ["a", 1]
+
+
+def test_csv_serializer(instances):
+    serializer = CSVSerializer(SerialDataClass, list_delimiter="|")
+    rows = list(
+        csv.reader(
+            io.StringIO(
+                serializer.header
+                + "".join([serializer.serialize(instance) for instance in instances])
+            )
+        )
+    )
+    assert rows == [
+        list(SerialDataClass.__annotations__),
+        ['Smith, "Jo"\nÿ', "3", "0.5", "True", "a|b,c", "1|2", "{'x': 1}", "enabled"],
+        ["plain", "0", "", "False", "", "", "{}", ""],
+    ]
+
+
+def test_write_jsonl(instances):
+    binary_file = io.BytesIO()
+    assert SerialDataClass.write_jsonl(iter(instances * 3), binary_file) == 6
+    text_file = io.StringIO()
+    assert SerialDataClass.write_jsonl(instances * 3, text_file, buffer_size=1) == 6
+    assert binary_file.getvalue().decode("utf-8") == text_file.getvalue()
+    assert len(text_file.getvalue().splitlines()) == 6
+
+
+def test_write_csv():
+    class ListDataClass(CastDataClass):
+        name: str
+        groups: List[str]
+
+        __class_config__ = {"list_delimiter": "/"}
+
+    instance = ListDataClass(name="a", groups=["x", "y"])
+    csv_file = io.StringIO()
+    assert ListDataClass.write_csv([instance], csv_file) == 1
+    assert csv_file.getvalue() == "name,groups\r\na,x/y\r\n"
+
+    csv_file = io.BytesIO()
+    ListDataClass.write_csv([instance], csv_file, header=False, delimiter="/")
+    ListDataClass.write_csv([instance], csv_file, header=False, list_delimiter=";")
+    assert csv_file.getvalue() == b'a/"x/y"\r\na,x;y\r\n'
+
+
+class CountingFile(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_csv_list_items_quoted():
+    class ListDataClass(CastDataClass):
+        groups: List[str]
+
+    groups = ["a", "b;c", 'd"e', "f\\g"]
+    csv_file = io.StringIO()
+    ListDataClass.write_csv([ListDataClass(groups=groups)], csv_file, header=False)
+    (value,) = next(csv.reader(io.StringIO(csv_file.getvalue())))
+    assert value == 'a;"b;c";"d""e";f\\g'
+    assert next(csv.reader([value], delimiter=";")) == groups
+
+
+@pytest.mark.parametrize(
+    "fileobj, expected_binary",
+    [
+        [io.StringIO(), False],
+        [io.BytesIO(), True],
+        [tempfile.SpooledTemporaryFile(mode="w+"), False],
+        [tempfile.SpooledTemporaryFile(mode="w+b"), True],
+        [CountingFile(), False],
+    ],
+    ids=["string_io", "bytes_io", "spooled_text", "spooled_binary", "text_subclass"],
+)
+def test_is_binary_file(fileobj, expected_binary):
+    assert is_binary_file(fileobj) is expected_binary
+    write_chunked(fileobj, ["ab\n"])
+    fileobj.seek(0)
+    assert fileobj.read() == (b"ab\n" if expected_binary else "ab\n")
+
+
+def test_write_chunked():
+    counting_file = CountingFile()
+    assert write_chunked(counting_file, ["ab\n"] * 10, buffer_size=9) == 10
+    assert counting_file.getvalue() == "ab\n" * 10
+    assert counting_file.writes == 4
+    assert write_chunked(counting_file, ["ab\n"], binary=False) == 1
+
+
+def test_write_chunked_explicit_binary():
+    class BinaryWriter:
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, chunk):
+            self.chunks.append(chunk)
+
+    writer = BinaryWriter()
+    write_chunked(writer, ["ÿ\n"], binary=True)
+    assert writer.chunks == ["ÿ\n".encode("utf-8")]
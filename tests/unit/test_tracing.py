@@ -0,0 +1,103 @@
+import logging
+import pytest
+
+from typing import List, Optional
+
+import datacaster
+
+from datacaster.classes import CastDataClass
+from datacaster import tracing
+
+
+class TracedDataClass(CastDataClass):
+    __class_config__ = {"cast_functions": {"fields": {"upper": lambda x: x.upper()}}}
+    integer: int
+    upper: str
+    groups: List[str]
+    default: str = "hello"
+    missing: Optional[str]
+
+
+class RecordingTracer(tracing.Tracer):
+    def __init__(self):
+        self.fields = []
+        self.instances = []
+
+    def on_field(self, cast_class, name, path, duration):
+        self.fields.append((cast_class.__name__, name, path))
+        assert duration >= 0
+
+    def on_instance(self, cast_class, duration):
+        self.instances.append(cast_class.__name__)
+
+
+@pytest.fixture
+def tracer():
+    tracer = RecordingTracer()
+    previous_tracer = datacaster.set_tracer(tracer)
+    yield tracer
+    datacaster.set_tracer(previous_tracer)
+
+
+EXPECTED_FIELDS = [
+    ("TracedDataClass", "integer", tracing.PATH_CAST),
+    ("TracedDataClass", "upper", tracing.PATH_CHECKED),
+    ("TracedDataClass", "groups", tracing.PATH_CAST),
+    ("TracedDataClass", "default", tracing.PATH_DEFAULT),
+    ("TracedDataClass", "missing", tracing.PATH_MISSING),
+]
+
+
+def test_set_tracer(tracer):
+    assert datacaster.get_tracer() is tracer
+    assert datacaster.set_tracer(None) is tracer
+    assert datacaster.get_tracer() is None
+    TracedDataClass(integer="1")
+    assert tracer.fields == []
+
+
+def test_init_traced(tracer):
+    instance = TracedDataClass(integer="1", upper="abc", groups="x")
+    assert vars(instance)["integer"] == 1
+    assert tracer.fields == EXPECTED_FIELDS
+    assert tracer.instances == ["TracedDataClass"]
+
+
+def test_from_rows_traced(tracer):
+    list(TracedDataClass.from_rows([("1", "abc", "x")], ["integer", "upper", "groups"]))
+    assert tracer.fields == EXPECTED_FIELDS
+    assert tracer.instances == ["TracedDataClass"]
+
+
+def test_field_function_path(tracer):
+    TracedDataClass(upper=b"abc")
+    assert ("TracedDataClass", "upper", tracing.PATH_FIELD_FUNCTION) in tracer.fields
+
+
+def test_sampling_tracer():
+    recording_tracer = RecordingTracer()
+    previous_tracer = datacaster.set_tracer(tracing.SamplingTracer(recording_tracer, 3))
+    try:
+        for _ in range(7):
+            TracedDataClass(integer=1)
+    finally:
+        datacaster.set_tracer(previous_tracer)
+    assert recording_tracer.instances == ["TracedDataClass"] * 3
+    assert len(recording_tracer.fields) == 3 * 5
+
+
+def test_logging_tracer(caplog):
+    previous_tracer = datacaster.set_tracer(tracing.LoggingTracer())
+    try:
+        with caplog.at_level(logging.DEBUG, logger="datacaster.tracing"):
+            TracedDataClass(integer="1")
+    finally:
+        datacaster.set_tracer(previous_tracer)
+
+    field_record, *_, instance_record = caplog.records
+    assert field_record.datacaster["field"] == "integer"
+    assert field_record.datacaster["path"] == tracing.PATH_CAST
+    assert field_record.getMessage().startswith(
+        "TracedDataClass.integer took path cast"
+    )
+    assert instance_record.datacaster["class"] == "TracedDataClass"
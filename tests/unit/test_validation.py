@@ -0,0 +1,120 @@
+import pytest
+
+from typing import List
+
+from datacaster.classes import CastDataClass
+from datacaster import exceptions, validation
+
+
+class LevelDataClass(CastDataClass):
+    __class_config__ = {
+        "cast_functions": {"fields": {"upper": lambda x: x.upper()}},
+        "always_cast": ["always"],
+    }
+    integer: int
+    upper: str
+    always: List[str]
+
+
+RECORD = {"integer": "1", "upper": "abc", "always": "x"}
+
+
+def test_full():
+    assert vars(next(LevelDataClass.from_records([RECORD]))) == {
+        "integer": 1,
+        "upper": "abc",
+        "always": ["x"],
+    }
+
+
+def test_cast_only():
+    assert vars(
+        next(LevelDataClass.from_records([RECORD], validation=validation.CAST_ONLY))
+    ) == {"integer": "1", "upper": "abc", "always": ["x"]}
+
+
+class WellTyped(CastDataClass):
+    __class_config__ = {
+        "cast_functions": {"fields": {"name": lambda x: x.upper()}},
+    }
+    name: str
+    groups: List[str]
+
+    def __cast_groups__(self, value):
+        return value.split(",")
+
+
+@pytest.mark.parametrize(
+    "level",
+    [validation.FULL, validation.CAST_ONLY, validation.sampled(0.5)],
+    ids=["full", "cast_only", "sampled"],
+)
+def test_well_typed_records_are_unchanged(level):
+    records = [{"name": "abc", "groups": ["a,b", "c"]}] * 4
+    assert [vars(instance) for instance in WellTyped.from_records(records, level)] == [
+        {"name": "abc", "groups": ["a,b", "c"]}
+    ] * 4
+
+
+def test_cast_only_casts_values_failing_their_check():
+    instance = next(
+        WellTyped.from_records(
+            [{"name": "abc", "groups": "a,b"}], validation=validation.CAST_ONLY
+        )
+    )
+    assert vars(instance) == {"name": "abc", "groups": ["a", "b"]}
+
+
+def test_class_level():
+    class CastOnly(CastDataClass):
+        __class_config__ = {"validation": validation.CAST_ONLY}
+        integer: int
+
+    assert CastOnly(integer="1").integer == "1"
+    assert next(CastOnly.from_rows([("1",)], ["integer"])).integer == "1"
+    assert list(CastOnly.to_frame([{"integer": "1"}]).column("integer")) == ["1"]
+    assert list(
+        CastOnly.to_frame([{"integer": "1"}], validation=validation.FULL).column(
+            "integer"
+        )
+    ) == [1]
+
+
+def test_sampled_every_nth():
+    sampled = validation.sampled(0.5, every_nth=True)
+    instances = list(
+        LevelDataClass.from_rows(
+            [("1",), ("2",), ("3",), ("4",)], ["integer"], validation=sampled
+        )
+    )
+    assert [instance.integer for instance in instances] == [1, "2", 3, "4"]
+    assert sampled.record_count == 4
+    assert sampled.checked_count == 2
+    assert sampled.violation_count == 2
+    assert list(sampled.violations) == [
+        ("LevelDataClass", "integer", str),
+        ("LevelDataClass", "integer", str),
+    ]
+
+
+def test_sampled_random():
+    sampled = validation.sampled(1)
+    assert [
+        instance.integer
+        for instance in LevelDataClass.from_records(
+            [{"integer": 1}, {"integer": "2"}], validation=sampled
+        )
+    ] == [1, 2]
+    assert sampled.checked_count == 2
+    assert sampled.violation_count == 1
+
+
+@pytest.mark.parametrize("rate", [0, 1.5, -1])
+def test_invalid_sample_rate(rate):
+    with pytest.raises(exceptions.InvalidValidationLevel):
+        validation.sampled(rate)
+
+
+def test_invalid_level():
+    with pytest.raises(exceptions.InvalidValidationLevel):
+        list(LevelDataClass.from_records([RECORD], validation="sometimes"))